@@ -5,55 +5,293 @@ import numpy as np
 import math
 import time
 import threading
+import queue
 import json
-from collections import deque
+import os
+from collections import defaultdict
+from functools import partial
+from enum import IntFlag
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional, fall back to plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+try:
+    import orjson
+    _json_dumps, _json_loads = orjson.dumps, orjson.loads
+except ImportError:
+    # orjson is optional, fall back to the standard library
+    def _json_dumps(obj):
+        return json.dumps(obj).encode()
+    _json_loads = json.loads
+
+try:
+    from pynput.keyboard import Controller as _KeyboardController, Key as _Key
+    _keyboard = _KeyboardController()
+except ImportError:
+    # pynput is optional, pyautogui sends the keys instead
+    _keyboard = None
+
+# pyautogui key names that are spelled differently in pynput's Key enum
+_PYNPUT_KEY_NAMES = {
+    'win': 'cmd', 'escape': 'esc', 'del': 'delete',
+    'volumeup': 'media_volume_up', 'volumedown': 'media_volume_down',
+    'volumemute': 'media_volume_mute', 'playpause': 'media_play_pause',
+    'nexttrack': 'media_next', 'prevtrack': 'media_previous'
+}
+
+# Finger bits of the gesture mask returned by detect_gesture
+THUMB, INDEX, MIDDLE, RING, PINKY = 1, 2, 4, 8, 16
+ALL_FINGERS = THUMB | INDEX | MIDDLE | RING | PINKY
+
+class GState(IntFlag):
+    """Advanced gesture states, several can be active at once"""
+    DRAG_MODE = 1
+    SCROLL_MODE = 2
+    ZOOM_MODE = 4
+    PRECISION_MODE = 8
+    KEYBOARD_MODE = 16
+    MEDIA_MODE = 32
+    WINDOW_MODE = 64
+    DRAWING_MODE = 128
+    TWO_HAND_MODE = 256
+
+@njit('f4(f4, f4, f4, f4)', cache=True, fastmath=True)
+def _dist(x1, y1, x2, y2):
+    """Euclidean distance between (x1, y1) and (x2, y2)"""
+    dx = x1 - x2
+    dy = y1 - y2
+    return (dx * dx + dy * dy) ** 0.5
+
+@njit('f4(f4, f4, f4, f4)', cache=True, fastmath=True)
+def _dist2(x1, y1, x2, y2):
+    """Squared distance between (x1, y1) and (x2, y2), for threshold checks"""
+    dx = x1 - x2
+    dy = y1 - y2
+    return dx * dx + dy * dy
+
+@njit('f4(f4, f4, f4, f4, f4, f4)', cache=True, fastmath=True)
+def _angle(x1, y1, x2, y2, x3, y3):
+    """Angle at (x2, y2) between the points (x1, y1) and (x3, y3), in degrees"""
+    v1x, v1y = x1 - x2, y1 - y2
+    v2x, v2y = x3 - x2, y3 - y2
+    
+    dot_product = v1x * v2x + v1y * v2y
+    magnitude1 = (v1x * v1x + v1y * v1y) ** 0.5
+    magnitude2 = (v2x * v2x + v2y * v2y) ** 0.5
+    
+    if magnitude1 == 0 or magnitude2 == 0:
+        return 0.0
+    
+    cos_angle = dot_product / (magnitude1 * magnitude2)
+    cos_angle = max(-1.0, min(1.0, cos_angle))
+    
+    return math.degrees(math.acos(cos_angle))
+
+@njit('f4(f4[:, ::1], i8, i8, i8)', cache=True, fastmath=True)
+def _landmark_angle(pts, i, j, k):
+    """Angle at landmark j between landmarks i and k of a landmark array"""
+    return _angle(pts[i, 0], pts[i, 1], pts[j, 0], pts[j, 1], pts[k, 0], pts[k, 1])
+
+@njit('i8(f4[:, ::1])', cache=True, fastmath=True)
+def _gesture_mask(pts):
+    """Gesture mask of a (21, 3) landmark array, bit i set when finger i is up"""
+    # Thumb (check x coordinate for left/right hand)
+    mask = THUMB if pts[4, 0] > pts[3, 0] else 0
+    
+    # Fingers are up when the tip is above the PIP joint
+    for finger in range(1, 5):
+        tip = 4 * finger + 4
+        if pts[tip, 1] < pts[tip - 2, 1]:
+            mask |= 1 << finger
+    return mask
+
+@njit('b1(f4[:, ::1])', cache=True, fastmath=True)
+def _palm_facing(pts):
+    """Whether the palm faces the camera, from the middle finger depth"""
+    return pts[12, 2] < pts[9, 2]
+
+def _pynput_key(name):
+    """pynput key for a pyautogui key name, None if pynput has no such key"""
+    if len(name) == 1:
+        return name
+    return getattr(_Key, _PYNPUT_KEY_NAMES.get(name, name), None)
+
+def _hotkey(*keys):
+    """Press keys together and release them in reverse, through pynput when available"""
+    if _keyboard is not None:
+        pressed = [_pynput_key(key) for key in keys]
+        if None not in pressed:
+            for key in pressed:
+                _keyboard.press(key)
+            for key in reversed(pressed):
+                _keyboard.release(key)
+            return
+    pyautogui.hotkey(*keys)
+
+def _press(key):
+    """Tap a single key, through pynput when available"""
+    if _keyboard is not None and _pynput_key(key) is not None:
+        _hotkey(key)
+    else:
+        pyautogui.press(key)
+
+def _landmark_array(landmarks):
+    """Copy 21 MediaPipe landmarks into a (21, 3) float32 array"""
+    return np.fromiter((v for lm in landmarks for v in (lm.x, lm.y, lm.z)),
+                       dtype=np.float32, count=63).reshape(21, 3)
+
+def _put_latest(q, item):
+    """Publish item on a bounded queue, dropping the stale entry if it is full"""
+    try:
+        q.get_nowait()
+    except queue.Empty:
+        pass
+    try:
+        q.put_nowait(item)
+    except queue.Full:
+        pass
+
+class OneEuroFilter:
+    """One-Euro low-pass filter over an array of landmark coordinates"""
+    def __init__(self, min_cutoff=1.0, beta=0.007, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+    
+    def reset(self):
+        """Forget the filtered state"""
+        self.x_prev = None
+        self.dx_prev = None
+        self.t_prev = 0
+    
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+    
+    def __call__(self, x, t):
+        """Filter sample x taken at time t"""
+        if self.x_prev is None or t <= self.t_prev:
+            self.x_prev = x
+            self.dx_prev = np.zeros_like(x)
+            self.t_prev = t
+            return x
+        
+        dt = t - self.t_prev
+        
+        # Smoothed speed drives the cutoff: slow motion is smoothed, fast motion is not
+        dx = (x - self.x_prev) / dt
+        dx_hat = self.dx_prev + self._alpha(self.d_cutoff, dt) * (dx - self.dx_prev)
+        cutoff = self.min_cutoff + self.beta * np.abs(dx_hat)
+        
+        a = self._alpha(cutoff, dt)
+        x_hat = self.x_prev + a * (x - self.x_prev)
+        
+        self.x_prev, self.dx_prev, self.t_prev = x_hat, dx_hat, t
+        return x_hat.astype(np.float32)
 
 class ComprehensiveGestureController:
+    # Application-specific shortcuts, available in every mode
+    APP_SHORTCUTS = {
+        # Browser shortcuts
+        INDEX | MIDDLE | PINKY: ('ctrl', 'shift', 't'),  # Reopen closed tab
+        THUMB | MIDDLE | RING | PINKY: ('ctrl', 'shift', 'n'),  # Incognito window
+        
+        # File manager shortcuts
+        THUMB | INDEX | RING: ('ctrl', 'shift', 'n'),  # New folder
+        INDEX | RING | PINKY: ('f2',),  # Rename
+        
+        # General shortcuts
+        THUMB | RING | PINKY: ('win', 'x'),  # Quick admin menu
+        MIDDLE | RING | PINKY: ('ctrl', 'shift', 'esc'),  # Task manager
+    }
+    
+    # MediaPipe's HAND_CONNECTIONS as six polylines: the five fingers and the base of the palm
+    HAND_CHAINS = [[0, 1, 2, 3, 4], [0, 5, 6, 7, 8], [5, 9, 10, 11, 12],
+                   [9, 13, 14, 15, 16], [13, 17, 18, 19, 20], [0, 17]]
+    
+    # Modes in the order the mode switch gesture cycles through them
+    MODES = ("NORMAL", "KEYBOARD", "MEDIA", "WINDOW", "GAMING", "DRAWING")
+    
+    # MediaPipe Tasks model next to this file, used instead of mp.solutions.hands when present
+    HAND_LANDMARKER_MODEL = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'hand_landmarker.task')
+    
     def __init__(self):
-        # Initialize MediaPipe
+        # Initialize MediaPipe, preferring the GPU-capable Tasks landmarker
         self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=2,  # Support two hands
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.5
-        )
-        self.mp_draw = mp.solutions.drawing_utils
+        self._landmarker = self._create_landmarker()
+        self._landmarker_ts = 0
+        self.hands = None
+        if self._landmarker is None:
+            self.hands = self.mp_hands.Hands(
+                static_image_mode=False,
+                max_num_hands=2,  # Support two hands
+                min_detection_confidence=0.7,
+                min_tracking_confidence=0.5
+            )
         
         # Screen and camera settings
         self.screen_width, self.screen_height = pyautogui.size()
         self.cam_width, self.cam_height = 640, 480
+        # Hand tracking runs on a smaller copy, landmarks are normalized anyway.
+        # 256x192 keeps the camera's 4:3 aspect so hands are not squashed
+        self._infer_size = (256, 192)
+        # Reused every detection, hands.process does not keep the image
+        self._small_buf = np.empty((self._infer_size[1], self._infer_size[0], 3), dtype=np.uint8)
+        self._rgb_buf = np.empty_like(self._small_buf)
         
         # Smoothing and tracking
         self.smoothening = 7
         self.prev_x, self.prev_y = 0, 0
-        self.gesture_history = deque(maxlen=10)
+        self._cursor_pos = tuple(pyautogui.position())
+        # Ring buffer of the last 10 index fingertip positions in camera pixels
+        self._hist = np.zeros((10, 2), dtype=np.int32)
+        self._hist_head = 0
+        self._hist_len = 0
+        self._pts = np.zeros((21, 3), dtype=np.float32)
+        # Camera pixel and screen coordinates of the current hand's landmarks
+        self._xy_cam = np.empty((21, 2), dtype=np.float32)
+        self._xy_scr = np.empty((21, 2), dtype=np.float32)
+        # Scale factors from normalized landmarks to camera pixels and screen pixels
+        self._cam_scale = np.array([self.cam_width, self.cam_height], dtype=np.float32)
+        self._scr_scale = np.array([self.screen_width, self.screen_height], dtype=np.float32)
         
         # Timing and cooldowns
         self.click_threshold = 35
-        self.last_click_time = 0
-        self.last_gesture_time = 0
+        self._click_threshold2 = self.click_threshold ** 2
         self.gesture_cooldown = 0.3
+        
+        # Minimum seconds between repeats of each action, keyed by action name,
+        # anything not listed here waits gesture_cooldown
+        self._action_cooldowns = {
+            'type': 0.3, 'volumeup': 0.15, 'volumedown': 0.15, 'volumemute': 0.5,
+            'prevtrack': 0.4, 'nexttrack': 0.4, 'playpause': 0.5, 'stop': 0.5,
+            'alt+tab': 0.5, 'win+l': 2.0, 'win+shift+s': 1.0, 'f5': 1.0,
+            'w': 0.05, 'a': 0.05, 's': 0.05, 'd': 0.05,
+            'shift+left': 0.05, 'shift+right': 0.05, 'shift+up': 0.05, 'shift+down': 0.05
+        }
+        self._last_action = defaultdict(float)
         self.long_press_duration = 1.0
-        self.gesture_start_time = {}
+        # Start time of the held gesture, indexed by gesture mask
+        self.gesture_start_time = [0.0] * (ALL_FINGERS + 1)
         
         # Advanced gesture states
-        self.gesture_states = {
-            'drag_mode': False,
-            'scroll_mode': False,
-            'zoom_mode': False,
-            'precision_mode': False,
-            'keyboard_mode': False,
-            'media_mode': False,
-            'window_mode': False,
-            'drawing_mode': False,
-            'two_hand_mode': False
-        }
+        self.gesture_states = GState(0)
         
         # Gesture tracking
-        self.persistent_gesture = None
+        self.persistent_gesture = -1
         self.gesture_duration = 0
+        # Clock sampled once per frame and shared by every gesture handler
+        self._now = time.perf_counter()
         self.last_two_hand_distance = 0
+        self._hands_xy = np.empty((2, 21, 2), dtype=np.float32)
         
         # Virtual keyboard layout
         self.virtual_keyboard = [
@@ -62,550 +300,741 @@ class ComprehensiveGestureController:
             ['A', 'S', 'D', 'F', 'G', 'H', 'J', 'K', 'L', 'ENTER'],
             ['Z', 'X', 'C', 'V', 'B', 'N', 'M', 'SPACE', 'BACK', 'ESC']
         ]
-        
-        # Drawing canvas
+        self._kb_overlay, self._kb_key_origins = self._render_keyboard(self.cam_width)
+        self._kb_lut, self._kb_keys_flat = self._build_keyboard_lut()
+        # Help panel, rendered on demand for each (mode, precision, width)
+        self._help_key = None
+        self._help_layer = None
+        # Status HUD, re-rendered only when the mode or gesture states change
+        self._hud_key = None
+        self._hud_layer = None
+        self._hud_inv_alpha = None
+        
+        # Drawing canvas, kept in host memory since only its drawn region is blended
         self.drawing_canvas = np.zeros((self.cam_height, self.cam_width, 3), dtype=np.uint8)
+        # Bounding box (x0, y0, x1, y1) of everything drawn so far, None while empty
+        self._canvas_bbox = None
         self.drawing_enabled = False
         
         # Settings
         pyautogui.FAILSAFE = True
-        pyautogui.PAUSE = 0.01
+        # Actions are already rate limited, no need for pyautogui's sleep after each call
+        pyautogui.PAUSE = 0
         
         # Mode display
         self.current_mode = "NORMAL"
         self.mode_switch_time = 0
         
+        # Gesture mask -> handlers, per mode
+        self._dispatch, self._always_dispatch = self._build_dispatch()
+        # Handlers run every frame whatever the gesture: safety checks first,
+        # then continuous tracking for the current mode
+        self._always_handlers = (self.handle_emergency_gestures,)
+        self._mode_handlers = {
+            "NORMAL": (self._smooth_cursor,)
+        }
+        # Per hand (mask, time, label) of the last discrete dispatch, lets a held
+        # gesture skip its discrete actions until the cooldown has passed
+        # and its one-shot actions until it is released
+        self._held = [(-1, 0.0, None)] * 2
+        self._action_text = None
+        
+        # Landmark tracking between full detections
+        self._detection_every = 3
+        self._frame_idx = 0
+        self._last_hands = ()
+        self._redetect = False
+        self._redetect_confidence = 0.5
+        # beta is tuned for pixels while landmarks are normalized
+        self._landmark_filters = [OneEuroFilter(min_cutoff=1.0, beta=0.007 * self.cam_width)
+                                  for _ in range(2)]
+        self._tracked_hands = 0
+        
+        # Capture / inference / action pipeline
+        self._frame_queue = queue.Queue(maxsize=1)
+        self._result_queue = queue.Queue(maxsize=1)
+        self._action_queue = queue.SimpleQueue()
+        self._frame_wanted = threading.Event()
+        self._stop_event = threading.Event()
+        self._action_thread = None
+        # First exception raised on a worker thread, re-raised by run()
+        self._worker_error = None
+        
+    def _emit(self, action, *args):
+        """Queue a pyautogui call so input latency never stalls the frame loop"""
+        if self._action_thread is None:
+            # Not driven by run(), execute inline
+            action(*args)
+        else:
+            self._action_queue.put((action, args))
+    
+    def _fire(self, name, action, *args):
+        """Emit an action unless it already fired within its cooldown"""
+        t = self._now
+        if t - self._last_action[name] > self._action_cooldowns.get(name, self.gesture_cooldown):
+            self._emit(action, *args)
+            self._last_action[name] = t
+            return True
+        return False
+    
     def get_distance(self, p1, p2):
         """Calculate Euclidean distance between two points"""
-        return math.sqrt((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)
+        return _dist(p1[0], p1[1], p2[0], p2[1])
     
     def get_angle(self, p1, p2, p3):
         """Calculate angle between three points"""
-        v1 = (p1[0] - p2[0], p1[1] - p2[1])
-        v2 = (p3[0] - p2[0], p3[1] - p2[1])
-        
-        dot_product = v1[0] * v2[0] + v1[1] * v2[1]
-        magnitude1 = math.sqrt(v1[0]**2 + v1[1]**2)
-        magnitude2 = math.sqrt(v2[0]**2 + v2[1]**2)
-        
-        if magnitude1 == 0 or magnitude2 == 0:
-            return 0
-        
-        cos_angle = dot_product / (magnitude1 * magnitude2)
-        cos_angle = max(-1, min(1, cos_angle))
-        
-        return math.degrees(math.acos(cos_angle))
+        return _angle(p1[0], p1[1], p2[0], p2[1], p3[0], p3[1])
     
-    def is_finger_up(self, landmarks, finger_tip, finger_pip):
+    def is_finger_up(self, pts, finger_tip, finger_pip):
         """Check if a finger is extended"""
-        return landmarks[finger_tip].y < landmarks[finger_pip].y
+        return pts[finger_tip, 1] < pts[finger_pip, 1]
     
-    def detect_gesture(self, landmarks):
+    def detect_gesture(self, pts):
         """Enhanced gesture detection"""
-        # Landmark indices
-        thumb_tip, thumb_ip = 4, 3
-        index_tip, index_pip = 8, 6
-        middle_tip, middle_pip = 12, 10
-        ring_tip, ring_pip = 16, 14
-        pinky_tip, pinky_pip = 20, 18
-        
-        fingers_up = []
-        
-        # Thumb (check x coordinate for left/right hand)
-        if landmarks[thumb_tip].x > landmarks[thumb_ip].x:
-            fingers_up.append(1)
-        else:
-            fingers_up.append(0)
-            
-        # Other fingers
-        for tip, pip in [(index_tip, index_pip), (middle_tip, middle_pip), 
-                        (ring_tip, ring_pip), (pinky_tip, pinky_pip)]:
-            if self.is_finger_up(landmarks, tip, pip):
-                fingers_up.append(1)
-            else:
-                fingers_up.append(0)
-        
-        return fingers_up
+        return _gesture_mask(pts)
     
-    def detect_hand_orientation(self, landmarks):
+    def detect_hand_orientation(self, pts):
         """Detect if hand is facing palm or back"""
-        # Use the relationship between wrist and middle finger MCP
-        wrist = landmarks[0]
-        middle_mcp = landmarks[9]
-        middle_tip = landmarks[12]
-        
-        # Calculate if palm is facing camera
-        palm_facing = middle_tip.z < middle_mcp.z
-        return "PALM" if palm_facing else "BACK"
+        return "PALM" if _palm_facing(pts) else "BACK"
     
     def switch_mode(self, new_mode):
         """Switch between different control modes"""
         if self.current_mode != new_mode:
             self.current_mode = new_mode
-            self.mode_switch_time = time.time()
+            self.mode_switch_time = time.perf_counter()
             # Reset all gesture states when switching modes
-            for key in self.gesture_states:
-                self.gesture_states[key] = False
+            self.gesture_states = GState(0)
     
-    def perform_basic_mouse_actions(self, landmarks, fingers_up, frame):
-        """Basic mouse control actions"""
-        index_tip = landmarks[8]
-        middle_tip = landmarks[12]
-        thumb_tip = landmarks[4]
-        ring_tip = landmarks[16]
-        
+    def _smooth_cursor(self, pts, frame):
+        """Smooth the index fingertip into screen coordinates"""
         # Convert to screen coordinates
-        x = int(index_tip.x * self.screen_width)
-        y = int(index_tip.y * self.screen_height)
+        x = int(self._xy_scr[8, 0])
+        y = int(self._xy_scr[8, 1])
         
         # Smooth movement
-        if self.gesture_states['precision_mode']:
+        if self.gesture_states & GState.PRECISION_MODE:
             # Slower, more precise movement
-            curr_x = self.prev_x + (x - self.prev_x) / (self.smoothening * 2)
-            curr_y = self.prev_y + (y - self.prev_y) / (self.smoothening * 2)
+            smoothening = self.smoothening * 2
         else:
-            curr_x = self.prev_x + (x - self.prev_x) / self.smoothening
-            curr_y = self.prev_y + (y - self.prev_y) / self.smoothening
+            smoothening = self.smoothening
         
-        current_time = time.time()
+        self.prev_x = self.prev_x + (x - self.prev_x) / smoothening
+        self.prev_y = self.prev_y + (y - self.prev_y) / smoothening
+    
+    def _move_cursor(self, pts, frame):
+        """Index only - Move cursor"""
+        self._emit(pyautogui.moveTo, self.prev_x, self.prev_y)
+        self._cursor_pos = (self.prev_x, self.prev_y)
+        cv2.circle(frame, (int(self._xy_cam[8, 0]), int(self._xy_cam[8, 1])), 12, (0, 255, 0), -1)
+        self.display_action(frame, "MOVE CURSOR")
+    
+    def _left_click(self, pts, frame):
+        """Index + Middle - Click actions"""
+        cam = self._xy_cam
+        distance2 = _dist2(cam[8, 0], cam[8, 1], cam[12, 0], cam[12, 1])
+        
+        if distance2 < self._click_threshold2:
+            if self._fire('click', pyautogui.click):
+                self.display_action(frame, "LEFT CLICK")
+        else:
+            self.display_action(frame, "READY TO CLICK")
+    
+    def _right_click(self, pts, frame):
+        """Thumb + Index + Middle - Right click"""
+        cam = self._xy_cam
+        distance2 = _dist2(cam[4, 0], cam[4, 1], cam[8, 0], cam[8, 1])
+        
+        if distance2 < self._click_threshold2:
+            if self._fire('rightclick', pyautogui.rightClick):
+                self.display_action(frame, "RIGHT CLICK")
+    
+    def _scroll(self, pts, frame):
+        """Index + Middle + Ring - Advanced scroll"""
+        middle_y = pts[12, 1]
+        ring_x = pts[16, 0]
         
-        # Gesture recognition
-        if fingers_up == [0, 1, 0, 0, 0]:  # Index only - Move cursor
-            pyautogui.moveTo(curr_x, curr_y)
-            cv2.circle(frame, (int(index_tip.x * self.cam_width), 
-                              int(index_tip.y * self.cam_height)), 12, (0, 255, 0), -1)
-            self.display_action(frame, "MOVE CURSOR")
-            
-        elif fingers_up == [0, 1, 1, 0, 0]:  # Index + Middle - Click actions
-            distance = self.get_distance(
-                (index_tip.x * self.cam_width, index_tip.y * self.cam_height),
-                (middle_tip.x * self.cam_width, middle_tip.y * self.cam_height)
-            )
-            
-            if distance < self.click_threshold:
-                if current_time - self.last_click_time > self.gesture_cooldown:
-                    pyautogui.click()
-                    self.last_click_time = current_time
-                    self.display_action(frame, "LEFT CLICK")
-            else:
-                self.display_action(frame, "READY TO CLICK")
-                
-        elif fingers_up == [1, 1, 1, 0, 0]:  # Thumb + Index + Middle - Right click
-            distance = self.get_distance(
-                (thumb_tip.x * self.cam_width, thumb_tip.y * self.cam_height),
-                (index_tip.x * self.cam_width, index_tip.y * self.cam_height)
-            )
-            
-            if distance < self.click_threshold:
-                if current_time - self.last_click_time > self.gesture_cooldown:
-                    pyautogui.rightClick()
-                    self.last_click_time = current_time
-                    self.display_action(frame, "RIGHT CLICK")
-        
-        self.prev_x, self.prev_y = curr_x, curr_y
-    
-    def perform_keyboard_actions(self, landmarks, fingers_up, frame):
-        """Virtual keyboard and text input"""
-        if fingers_up == [1, 1, 0, 0, 0]:  # Thumb + Index - Type mode
-            self.draw_virtual_keyboard(frame)
-            # Detect which key is being pointed at
-            key = self.detect_keyboard_selection(landmarks)
-            if key:
-                self.display_action(frame, f"SELECT: {key}")
-                # Type the character when fingers close
-                index_tip = landmarks[8]
-                thumb_tip = landmarks[4]
-                distance = self.get_distance(
-                    (index_tip.x * self.cam_width, index_tip.y * self.cam_height),
-                    (thumb_tip.x * self.cam_width, thumb_tip.y * self.cam_height)
-                )
-                if distance < 25:
-                    self.type_character(key)
-        
-        elif fingers_up == [0, 1, 1, 1, 0]:  # Index + Middle + Ring - Text shortcuts
-            middle_y = landmarks[12].y
+        # Vertical scroll
+        if ring_x < 0.3 or ring_x > 0.7:
             if middle_y < 0.3:
-                pyautogui.hotkey('ctrl', 'c')  # Copy
-                self.display_action(frame, "COPY")
+                self._emit(pyautogui.scroll, 5)  # Fast scroll up
+                self.display_action(frame, "FAST SCROLL UP")
             elif middle_y > 0.7:
-                pyautogui.hotkey('ctrl', 'v')  # Paste
-                self.display_action(frame, "PASTE")
-            else:
-                pyautogui.hotkey('ctrl', 'x')  # Cut
-                self.display_action(frame, "CUT")
-    
-    def perform_media_controls(self, landmarks, fingers_up, frame):
-        """Media playback controls"""
-        if fingers_up == [1, 0, 0, 0, 1]:  # Thumb + Pinky - Volume
-            thumb_y = landmarks[4].y
-            if thumb_y < 0.3:
-                pyautogui.press('volumeup')
-                self.display_action(frame, "VOLUME UP")
-            elif thumb_y > 0.7:
-                pyautogui.press('volumedown')
-                self.display_action(frame, "VOLUME DOWN")
-            else:
-                pyautogui.press('volumemute')
-                self.display_action(frame, "MUTE TOGGLE")
-                
-        elif fingers_up == [0, 1, 0, 1, 0]:  # Index + Ring - Media control
-            index_x = landmarks[8].x
-            if index_x < 0.3:
-                pyautogui.press('prevtrack')
-                self.display_action(frame, "PREVIOUS TRACK")
-            elif index_x > 0.7:
-                pyautogui.press('nexttrack')
-                self.display_action(frame, "NEXT TRACK")
-            else:
-                pyautogui.press('playpause')
-                self.display_action(frame, "PLAY/PAUSE")
-                
-        elif fingers_up == [0, 0, 1, 0, 0]:  # Middle finger only - Stop
-            pyautogui.press('stop')
-            self.display_action(frame, "STOP MEDIA")
-    
-    def perform_window_management(self, landmarks, fingers_up, frame):
-        """Window and application management"""
-        if fingers_up == [1, 1, 0, 0, 1]:  # Thumb + Index + Pinky - Window actions
-            index_y = landmarks[8].y
-            if index_y < 0.25:
-                pyautogui.hotkey('win', 'up')  # Maximize
-                self.display_action(frame, "MAXIMIZE WINDOW")
-            elif index_y > 0.75:
-                pyautogui.hotkey('win', 'down')  # Minimize
-                self.display_action(frame, "MINIMIZE WINDOW")
-            elif landmarks[8].x < 0.3:
-                pyautogui.hotkey('win', 'left')  # Snap left
-                self.display_action(frame, "SNAP LEFT")
-            elif landmarks[8].x > 0.7:
-                pyautogui.hotkey('win', 'right')  # Snap right
-                self.display_action(frame, "SNAP RIGHT")
-            else:
-                pyautogui.hotkey('alt', 'tab')  # Alt+Tab
-                self.display_action(frame, "SWITCH WINDOW")
-                
-        elif fingers_up == [1, 0, 1, 0, 1]:  # Thumb + Middle + Pinky - Desktop actions
-            middle_x = landmarks[12].x
-            if middle_x < 0.3:
-                pyautogui.hotkey('ctrl', 'win', 'left')  # Switch desktop left
-                self.display_action(frame, "DESKTOP LEFT")
-            elif middle_x > 0.7:
-                pyautogui.hotkey('ctrl', 'win', 'right')  # Switch desktop right
-                self.display_action(frame, "DESKTOP RIGHT")
+                self._emit(pyautogui.scroll, -5)  # Fast scroll down
+                self.display_action(frame, "FAST SCROLL DOWN")
+        else:
+            # Horizontal scroll
+            if middle_y < 0.4:
+                self._emit(pyautogui.hscroll, 3)  # Horizontal scroll left
+                self.display_action(frame, "SCROLL LEFT")
+            elif middle_y > 0.6:
+                self._emit(pyautogui.hscroll, -3)  # Horizontal scroll right
+                self.display_action(frame, "SCROLL RIGHT")
+    
+    def _type_key(self, pts, frame):
+        """Thumb + Index - Type mode"""
+        cam = self._xy_cam
+        # Detect which key is being pointed at
+        key = self.detect_keyboard_selection(pts)
+        self.draw_virtual_keyboard(frame, key)
+        if key:
+            self.display_action(frame, f"SELECT: {key}")
+            # Type the character when fingers close
+            if _dist2(cam[8, 0], cam[8, 1], cam[4, 0], cam[4, 1]) < 25 ** 2:
+                self.type_character(key)
+    
+    def _text_shortcut(self, pts, frame):
+        """Index + Middle + Ring - Text shortcuts"""
+        middle_y = pts[12, 1]
+        if middle_y < 0.3:
+            self._fire('ctrl+c', _hotkey, 'ctrl', 'c')  # Copy
+            self.display_action(frame, "COPY")
+        elif middle_y > 0.7:
+            self._fire('ctrl+v', _hotkey, 'ctrl', 'v')  # Paste
+            self.display_action(frame, "PASTE")
+        else:
+            self._fire('ctrl+x', _hotkey, 'ctrl', 'x')  # Cut
+            self.display_action(frame, "CUT")
+    
+    def _select_text(self, pts, frame):
+        """Thumb + Index - Text selection"""
+        # Calculate selection direction and distance
+        thumb_x, thumb_y = pts[4, 0], pts[4, 1]
+        index_x, index_y = pts[8, 0], pts[8, 1]
+        
+        # Selection based on hand movement
+        if abs(index_x - thumb_x) > 0.1:  # Horizontal selection
+            if index_x > thumb_x:
+                self._fire('shift+right', _hotkey, 'shift', 'right')
+                self.display_action(frame, "SELECT RIGHT")
             else:
-                pyautogui.hotkey('win', 'd')  # Show desktop
-                self.display_action(frame, "SHOW DESKTOP")
-    
-    def perform_browser_actions(self, landmarks, fingers_up, frame):
-        """Browser-specific controls"""
-        if fingers_up == [0, 1, 1, 1, 1]:  # Four fingers no thumb - Browser navigation
-            index_x = landmarks[8].x
-            middle_y = landmarks[12].y
-            
-            if index_x < 0.2:
-                pyautogui.hotkey('alt', 'left')  # Back
-                self.display_action(frame, "BROWSER BACK")
-            elif index_x > 0.8:
-                pyautogui.hotkey('alt', 'right')  # Forward
-                self.display_action(frame, "BROWSER FORWARD")
-            elif middle_y < 0.2:
-                pyautogui.hotkey('ctrl', 't')  # New tab
-                self.display_action(frame, "NEW TAB")
-            elif middle_y > 0.8:
-                pyautogui.hotkey('ctrl', 'w')  # Close tab
-                self.display_action(frame, "CLOSE TAB")
+                self._fire('shift+left', _hotkey, 'shift', 'left')
+                self.display_action(frame, "SELECT LEFT")
+        elif abs(index_y - thumb_y) > 0.1:  # Vertical selection
+            if index_y < thumb_y:
+                self._fire('shift+up', _hotkey, 'shift', 'up')
+                self.display_action(frame, "SELECT UP")
             else:
-                pyautogui.hotkey('f5')  # Refresh
-                self.display_action(frame, "REFRESH PAGE")
-    
-    def perform_system_actions(self, landmarks, fingers_up, frame):
-        """System-level controls"""
-        # L-shape gesture (Thumb + Index perpendicular) - Screenshot
-        if fingers_up == [1, 1, 0, 0, 0]:
-            thumb_pos = (landmarks[4].x, landmarks[4].y)
-            index_pos = (landmarks[8].x, landmarks[8].y)
-            
-            # Check if fingers form L-shape
-            angle = self.get_angle(
-                (thumb_pos[0] * self.cam_width, thumb_pos[1] * self.cam_height),
-                (landmarks[2].x * self.cam_width, landmarks[2].y * self.cam_height),
-                (index_pos[0] * self.cam_width, index_pos[1] * self.cam_height)
-            )
+                self._fire('shift+down', _hotkey, 'shift', 'down')
+                self.display_action(frame, "SELECT DOWN")
+    
+    def _volume_control(self, pts, frame):
+        """Thumb + Pinky - Volume"""
+        thumb_y = pts[4, 1]
+        if thumb_y < 0.3:
+            self._fire('volumeup', _press, 'volumeup')
+            self.display_action(frame, "VOLUME UP")
+        elif thumb_y > 0.7:
+            self._fire('volumedown', _press, 'volumedown')
+            self.display_action(frame, "VOLUME DOWN")
+        else:
+            self._fire('volumemute', _press, 'volumemute')
+            self.display_action(frame, "MUTE TOGGLE")
+    
+    def _track_control(self, pts, frame):
+        """Index + Ring - Media control"""
+        index_x = pts[8, 0]
+        if index_x < 0.3:
+            self._fire('prevtrack', _press, 'prevtrack')
+            self.display_action(frame, "PREVIOUS TRACK")
+        elif index_x > 0.7:
+            self._fire('nexttrack', _press, 'nexttrack')
+            self.display_action(frame, "NEXT TRACK")
+        else:
+            self._fire('playpause', _press, 'playpause')
+            self.display_action(frame, "PLAY/PAUSE")
+    
+    def _stop_media(self, pts, frame):
+        """Middle finger only - Stop"""
+        self._fire('stop', _press, 'stop')
+        self.display_action(frame, "STOP MEDIA")
+    
+    def _window_action(self, pts, frame):
+        """Thumb + Index + Pinky - Window actions"""
+        index_y = pts[8, 1]
+        if index_y < 0.25:
+            self._fire('win+up', _hotkey, 'win', 'up')  # Maximize
+            self.display_action(frame, "MAXIMIZE WINDOW")
+        elif index_y > 0.75:
+            self._fire('win+down', _hotkey, 'win', 'down')  # Minimize
+            self.display_action(frame, "MINIMIZE WINDOW")
+        elif pts[8, 0] < 0.3:
+            self._fire('win+left', _hotkey, 'win', 'left')  # Snap left
+            self.display_action(frame, "SNAP LEFT")
+        elif pts[8, 0] > 0.7:
+            self._fire('win+right', _hotkey, 'win', 'right')  # Snap right
+            self.display_action(frame, "SNAP RIGHT")
+        else:
+            self._fire('alt+tab', _hotkey, 'alt', 'tab')  # Alt+Tab
+            self.display_action(frame, "SWITCH WINDOW")
+    
+    def _desktop_action(self, pts, frame):
+        """Thumb + Middle + Pinky - Desktop actions"""
+        middle_x = pts[12, 0]
+        if middle_x < 0.3:
+            self._fire('ctrl+win+left', _hotkey, 'ctrl', 'win', 'left')  # Switch desktop left
+            self.display_action(frame, "DESKTOP LEFT")
+        elif middle_x > 0.7:
+            self._fire('ctrl+win+right', _hotkey, 'ctrl', 'win', 'right')  # Switch desktop right
+            self.display_action(frame, "DESKTOP RIGHT")
+        else:
+            self._fire('win+d', _hotkey, 'win', 'd')  # Show desktop
+            self.display_action(frame, "SHOW DESKTOP")
+    
+    def _browser_navigation(self, pts, frame):
+        """Four fingers no thumb - Browser navigation"""
+        index_x = pts[8, 0]
+        middle_y = pts[12, 1]
+        
+        if index_x < 0.2:
+            self._fire('alt+left', _hotkey, 'alt', 'left')  # Back
+            self.display_action(frame, "BROWSER BACK")
+        elif index_x > 0.8:
+            self._fire('alt+right', _hotkey, 'alt', 'right')  # Forward
+            self.display_action(frame, "BROWSER FORWARD")
+        elif middle_y < 0.2:
+            self._fire('ctrl+t', _hotkey, 'ctrl', 't')  # New tab
+            self.display_action(frame, "NEW TAB")
+        elif middle_y > 0.8:
+            self._fire('ctrl+w', _hotkey, 'ctrl', 'w')  # Close tab
+            self.display_action(frame, "CLOSE TAB")
+        else:
+            self._fire('f5', _hotkey, 'f5')  # Refresh
+            self.display_action(frame, "REFRESH PAGE")
+    
+    def _wasd_move(self, pts, frame):
+        """Index + Pinky - WASD movement"""
+        x, y = pts[8, 0], pts[8, 1]
+        
+        if x < 0.3:
+            self._fire('a', _press, 'a')  # Left
+            self.display_action(frame, "MOVE LEFT")
+        elif x > 0.7:
+            self._fire('d', _press, 'd')  # Right
+            self.display_action(frame, "MOVE RIGHT")
+        elif y < 0.3:
+            self._fire('w', _press, 'w')  # Up
+            self.display_action(frame, "MOVE UP")
+        elif y > 0.7:
+            self._fire('s', _press, 's')  # Down
+            self.display_action(frame, "MOVE DOWN")
+    
+    def _jump(self, pts, frame):
+        """Thumb only - Space/Jump"""
+        self._fire('space', _press, 'space')
+        self.display_action(frame, "JUMP/SPACE")
+    
+    def _draw(self, pts, frame):
+        """Index only - Draw"""
+        if self.drawing_enabled:
+            ix, iy = int(self._xy_cam[8, 0]), int(self._xy_cam[8, 1])
+            cv2.circle(self.drawing_canvas, (ix, iy), 5, (0, 255, 255), -1)
             
-            if 80 < angle < 100:  # Close to 90 degrees
-                pyautogui.hotkey('win', 'shift', 's')  # Screenshot
-                self.display_action(frame, "SCREENSHOT")
-        
-        # Peace sign (Index + Middle separated) - Lock screen
-        elif fingers_up == [0, 1, 1, 0, 0]:
-            distance = self.get_distance(
-                (landmarks[8].x * self.cam_width, landmarks[8].y * self.cam_height),
-                (landmarks[12].x * self.cam_width, landmarks[12].y * self.cam_height)
-            )
-            if distance > 60:  # Fingers spread apart
-                if time.time() - self.last_gesture_time > 2:  # Long cooldown for lock
-                    pyautogui.hotkey('win', 'l')
-                    self.last_gesture_time = time.time()
-                    self.display_action(frame, "LOCK SCREEN")
-    
-    def perform_drawing_actions(self, landmarks, fingers_up, frame):
-        """Drawing and annotation features"""
-        index_tip = landmarks[8]
-        ix, iy = int(index_tip.x * self.cam_width), int(index_tip.y * self.cam_height)
-        
-        if fingers_up == [0, 1, 0, 0, 0]:  # Index only - Draw
-            if self.drawing_enabled:
-                cv2.circle(self.drawing_canvas, (ix, iy), 5, (0, 255, 255), -1)
-                self.display_action(frame, "DRAWING")
-        
-        elif fingers_up == [1, 1, 1, 1, 1]:  # All fingers - Clear canvas
-            if np.any(self.drawing_canvas):
-                self.drawing_canvas = np.zeros((self.cam_height, self.cam_width, 3), dtype=np.uint8)
-                self.display_action(frame, "CLEAR CANVAS")
+            # Grow the dirty box by the stroke, clipped to the canvas
+            x0, y0 = max(ix - 5, 0), max(iy - 5, 0)
+            x1, y1 = min(ix + 6, self.cam_width), min(iy + 6, self.cam_height)
+            if x0 < x1 and y0 < y1:
+                if self._canvas_bbox is not None:
+                    bx0, by0, bx1, by1 = self._canvas_bbox
+                    x0, y0, x1, y1 = min(x0, bx0), min(y0, by0), max(x1, bx1), max(y1, by1)
+                self._canvas_bbox = (x0, y0, x1, y1)
+            self.display_action(frame, "DRAWING")
+    
+    def _clear_canvas(self, pts, frame):
+        """All fingers - Clear canvas"""
+        # Only the drawn region can hold strokes, clear it in place
+        if self._canvas_bbox is not None:
+            x0, y0, x1, y1 = self._canvas_bbox
+            self.drawing_canvas[y0:y1, x0:x1] = 0
+        self._canvas_bbox = None
+        self.display_action(frame, "CLEAR CANVAS")
+    
+    def _screenshot(self, pts, frame):
+        """L-shape gesture (Thumb + Index perpendicular) - Screenshot"""
+        # Check if fingers form L-shape
+        angle = _landmark_angle(self._xy_cam, 4, 2, 8)
+        
+        if 80 < angle < 100:  # Close to 90 degrees
+            self._fire('win+shift+s', _hotkey, 'win', 'shift', 's')  # Screenshot
+            self.display_action(frame, "SCREENSHOT")
+    
+    def _lock_screen(self, pts, frame):
+        """Peace sign (Index + Middle separated) - Lock screen"""
+        cam = self._xy_cam
+        if _dist2(cam[8, 0], cam[8, 1], cam[12, 0], cam[12, 1]) > 60 ** 2:  # Fingers spread apart
+            if self._fire('win+l', _hotkey, 'win', 'l'):  # Long cooldown for lock
+                self.display_action(frame, "LOCK SCREEN")
+    
+    def _accessibility_shortcut(self, pts, frame):
+        """Thumb + Index + Middle + Pinky - Accessibility"""
+        middle_y = pts[12, 1]
+        if middle_y < 0.3:
+            self._fire('win++', _hotkey, 'win', '+')  # Magnifier
+            self.display_action(frame, "MAGNIFIER")
+        elif middle_y > 0.7:
+            self._fire('win+u', _hotkey, 'win', 'u')  # Ease of Access
+            self.display_action(frame, "EASE OF ACCESS")
+        else:
+            self._fire('win+ctrl+enter', _hotkey, 'win', 'ctrl', 'enter')  # Narrator
+            self.display_action(frame, "NARRATOR")
+    
+    def _presentation_control(self, pts, frame):
+        """Index + Ring - Presentation control"""
+        index_x = pts[8, 0]
+        ring_y = pts[16, 1]
+        
+        if index_x < 0.3:
+            self._fire('left', _press, 'left')  # Previous slide
+            self.display_action(frame, "PREVIOUS SLIDE")
+        elif index_x > 0.7:
+            self._fire('right', _press, 'right')  # Next slide
+            self.display_action(frame, "NEXT SLIDE")
+        elif ring_y < 0.3:
+            self._fire('f5', _press, 'f5')  # Start slideshow
+            self.display_action(frame, "START SLIDESHOW")
+        elif ring_y > 0.7:
+            self._fire('escape', _press, 'escape')  # Exit slideshow
+            self.display_action(frame, "EXIT SLIDESHOW")
+    
+    def _meeting_control(self, pts, frame):
+        """Thumb + Ring - Video controls"""
+        thumb_y = pts[4, 1]
+        ring_x = pts[16, 0]
+        
+        if thumb_y < 0.3:
+            self._fire('alt+v', _hotkey, 'alt', 'v')  # Toggle video
+            self.display_action(frame, "TOGGLE VIDEO")
+        elif thumb_y > 0.7:
+            self._fire('alt+a', _hotkey, 'alt', 'a')  # Toggle audio
+            self.display_action(frame, "TOGGLE AUDIO")
+        elif ring_x < 0.3:
+            self._fire('alt+s', _hotkey, 'alt', 's')  # Share screen
+            self.display_action(frame, "SHARE SCREEN")
+        elif ring_x > 0.7:
+            self._fire('alt+r', _hotkey, 'alt', 'r')  # Record
+            self.display_action(frame, "TOGGLE RECORD")
+    
+    def _app_shortcut(self, keys, pts, frame):
+        """Custom application shortcuts"""
+        self._fire('+'.join(keys), _hotkey, *keys)
+        action_name = ' + '.join(keys).upper()
+        self.display_action(frame, f"SHORTCUT: {action_name}")
+    
+    def _build_dispatch(self):
+        """Build the per-mode gesture mask -> (continuous, discrete, one-shot) handlers tables"""
+        # Always available actions
+        always = {
+            THUMB | MIDDLE | RING: (self._cycle_mode,),
+            THUMB | INDEX: (self._screenshot,),
+            INDEX | MIDDLE: (self._lock_screen,),
+            THUMB | INDEX | MIDDLE | PINKY: (self._accessibility_shortcut,),
+            INDEX | RING: (self._presentation_control,),
+            THUMB | RING: (self._meeting_control,)
+        }
+        for mask, keys in self.APP_SHORTCUTS.items():
+            always[mask] = always.get(mask, ()) + (partial(self._app_shortcut, keys),)
+        
+        # Mode-specific actions run before the always available ones
+        modes = {
+            "NORMAL": {
+                INDEX: (self._move_cursor,),
+                INDEX | MIDDLE: (self._left_click,),
+                THUMB | INDEX | MIDDLE: (self._right_click,),
+                INDEX | MIDDLE | RING: (self._scroll,)
+            },
+            "KEYBOARD": {
+                THUMB | INDEX: (self._type_key, self._select_text),
+                INDEX | MIDDLE | RING: (self._text_shortcut,)
+            },
+            "MEDIA": {
+                THUMB | PINKY: (self._volume_control,),
+                INDEX | RING: (self._track_control,),
+                MIDDLE: (self._stop_media,)
+            },
+            "WINDOW": {
+                THUMB | INDEX | PINKY: (self._window_action,),
+                THUMB | MIDDLE | PINKY: (self._desktop_action,),
+                INDEX | MIDDLE | RING | PINKY: (self._browser_navigation,)
+            },
+            "GAMING": {
+                INDEX | PINKY: (self._wasd_move,),
+                THUMB: (self._jump,)
+            },
+            "DRAWING": {
+                INDEX: (self._draw,),
+                ALL_FINGERS: (self._clear_canvas,)
+            }
+        }
+        
+        # Handlers that follow the hand's position and must run every frame,
+        # the rest are discrete actions
+        continuous = {
+            self._move_cursor, self._left_click, self._right_click, self._scroll,
+            self._type_key, self._select_text, self._volume_control, self._wasd_move, self._draw
+        }
+        # Toggles that fire once when the gesture starts and never repeat while it is held
+        one_shot = {self._cycle_mode}
+        
+        def split(table):
+            return {mask: (tuple(h for h in handlers if h in continuous),
+                           tuple(h for h in handlers if h not in continuous and h not in one_shot),
+                           tuple(h for h in handlers if h in one_shot))
+                    for mask, handlers in table.items()}
+        
+        dispatch = {}
+        for mode, handlers in modes.items():
+            table = dict(handlers)
+            for mask, extra in always.items():
+                table[mask] = table.get(mask, ()) + extra
+            dispatch[mode] = split(table)
+        return dispatch, split(always)
     
     def perform_two_hand_gestures(self, all_landmarks, frame):
         """Advanced two-hand gestures"""
         if len(all_landmarks) == 2:
-            hand1, hand2 = all_landmarks[0], all_landmarks[1]
+            # Both filtered hands in camera pixels, filled in by main_gesture_processor
+            hands_xy = self._hands_xy
             
             # Calculate distance between palms
-            palm1 = (hand1[9].x * self.cam_width, hand1[9].y * self.cam_height)
-            palm2 = (hand2[9].x * self.cam_width, hand2[9].y * self.cam_height)
-            distance = self.get_distance(palm1, palm2)
+            palms = hands_xy[:, 9]
+            distance = float(np.linalg.norm(palms[0] - palms[1]))
             
             # Two-hand zoom
             if self.last_two_hand_distance > 0:
                 if distance > self.last_two_hand_distance + 20:
-                    pyautogui.hotkey('ctrl', '+')
+                    self._fire('ctrl++', _hotkey, 'ctrl', '+')
                     self.display_action(frame, "TWO-HAND ZOOM IN")
                 elif distance < self.last_two_hand_distance - 20:
-                    pyautogui.hotkey('ctrl', '-')
+                    self._fire('ctrl+-', _hotkey, 'ctrl', '-')
                     self.display_action(frame, "TWO-HAND ZOOM OUT")
             
             self.last_two_hand_distance = distance
             
             # Two-hand rotate (simulate)
-            if palm1[1] < self.cam_height * 0.3 and palm2[1] < self.cam_height * 0.3:
-                pyautogui.hotkey('ctrl', 'shift', 'r')  # Rotate (application dependent)
+            if (palms[:, 1] < self.cam_height * 0.3).all():
+                self._fire('ctrl+shift+r', _hotkey, 'ctrl', 'shift', 'r')  # Rotate (application dependent)
                 self.display_action(frame, "ROTATE GESTURE")
     
-    def perform_advanced_shortcuts(self, landmarks, fingers_up, frame):
+    def perform_advanced_shortcuts(self, pts, mask, frame):
         """Advanced keyboard shortcuts"""
-        current_time = time.time()
-        
-        if fingers_up == [1, 0, 1, 0, 0]:  # Thumb + Middle - File operations
-            middle_y = landmarks[12].y
+        if mask == THUMB | MIDDLE:  # Thumb + Middle - File operations
+            middle_y = pts[12, 1]
             if middle_y < 0.3:
-                pyautogui.hotkey('ctrl', 'n')  # New file
+                self._fire('ctrl+n', _hotkey, 'ctrl', 'n')  # New file
                 self.display_action(frame, "NEW FILE")
             elif middle_y > 0.7:
-                pyautogui.hotkey('ctrl', 's')  # Save
+                self._fire('ctrl+s', _hotkey, 'ctrl', 's')  # Save
                 self.display_action(frame, "SAVE FILE")
             else:
-                pyautogui.hotkey('ctrl', 'o')  # Open
+                self._fire('ctrl+o', _hotkey, 'ctrl', 'o')  # Open
                 self.display_action(frame, "OPEN FILE")
                 
-        elif fingers_up == [0, 0, 1, 1, 0]:  # Middle + Ring - Undo/Redo
-            ring_x = landmarks[16].x
+        elif mask == MIDDLE | RING:  # Middle + Ring - Undo/Redo
+            ring_x = pts[16, 0]
             if ring_x < 0.4:
-                pyautogui.hotkey('ctrl', 'z')  # Undo
+                self._fire('ctrl+z', _hotkey, 'ctrl', 'z')  # Undo
                 self.display_action(frame, "UNDO")
             else:
-                pyautogui.hotkey('ctrl', 'y')  # Redo
+                self._fire('ctrl+y', _hotkey, 'ctrl', 'y')  # Redo
                 self.display_action(frame, "REDO")
                 
-        elif fingers_up == [0, 0, 0, 1, 1]:  # Ring + Pinky - Find/Replace
-            ring_y = landmarks[16].y
+        elif mask == RING | PINKY:  # Ring + Pinky - Find/Replace
+            ring_y = pts[16, 1]
             if ring_y < 0.4:
-                pyautogui.hotkey('ctrl', 'f')  # Find
+                self._fire('ctrl+f', _hotkey, 'ctrl', 'f')  # Find
                 self.display_action(frame, "FIND")
             else:
-                pyautogui.hotkey('ctrl', 'h')  # Replace
+                self._fire('ctrl+h', _hotkey, 'ctrl', 'h')  # Replace
                 self.display_action(frame, "REPLACE")
     
-    def perform_gaming_actions(self, landmarks, fingers_up, frame):
-        """Gaming-specific controls"""
-        if fingers_up == [0, 1, 0, 0, 1]:  # Index + Pinky - WASD movement
-            index_pos = landmarks[8]
-            x, y = index_pos.x, index_pos.y
-            
-            if x < 0.3:
-                pyautogui.press('a')  # Left
-                self.display_action(frame, "MOVE LEFT")
-            elif x > 0.7:
-                pyautogui.press('d')  # Right
-                self.display_action(frame, "MOVE RIGHT")
-            elif y < 0.3:
-                pyautogui.press('w')  # Up
-                self.display_action(frame, "MOVE UP")
-            elif y > 0.7:
-                pyautogui.press('s')  # Down
-                self.display_action(frame, "MOVE DOWN")
-                
-        elif fingers_up == [1, 0, 0, 0, 0]:  # Thumb only - Space/Jump
-            pyautogui.press('space')
-            self.display_action(frame, "JUMP/SPACE")
-    
-    def detect_keyboard_selection(self, landmarks):
+    def detect_keyboard_selection(self, pts):
         """Detect which virtual key is being pointed at"""
-        index_tip = landmarks[8]
-        x, y = int(index_tip.x * self.cam_width), int(index_tip.y * self.cam_height)
+        x, y = int(self._xy_cam[8, 0]), int(self._xy_cam[8, 1])
         
         # Virtual keyboard area
-        kb_start_y = self.cam_height - 160
-        if y >= kb_start_y:
-            row = (y - kb_start_y) // 35
-            col = x // 60
-            
-            if 0 <= row < len(self.virtual_keyboard) and 0 <= col < len(self.virtual_keyboard[row]):
-                return self.virtual_keyboard[row][col]
+        y -= self.cam_height - 160
+        if 0 <= y < 160 and 0 <= x < self.cam_width:
+            idx = self._kb_lut[y, x]
+            if idx >= 0:
+                return self._kb_keys_flat[idx]
         return None
     
+    def _build_keyboard_lut(self):
+        """Map every pixel of the keyboard strip to the index of its key"""
+        lut = np.full((160, self.cam_width), -1, dtype=np.int16)
+        keys = []
+        
+        # Each key owns a 60x35 cell of the strip
+        for row_idx, row in enumerate(self.virtual_keyboard):
+            for col_idx, key in enumerate(row):
+                lut[row_idx * 35:(row_idx + 1) * 35, col_idx * 60:(col_idx + 1) * 60] = len(keys)
+                keys.append(key)
+        
+        return lut, keys
+    
     def type_character(self, char):
         """Type a character based on virtual keyboard selection"""
-        current_time = time.time()
-        if current_time - self.last_click_time > 0.3:  # Typing cooldown
-            if char == 'SPACE':
-                pyautogui.press('space')
-            elif char == 'BACK':
-                pyautogui.press('backspace')
-            elif char == 'ENTER':
-                pyautogui.press('enter')
-            elif char == 'ESC':
-                pyautogui.press('escape')
-            else:
-                pyautogui.write(char.lower())
-            self.last_click_time = current_time
+        if char == 'SPACE':
+            self._fire('type', _press, 'space')
+        elif char == 'BACK':
+            self._fire('type', _press, 'backspace')
+        elif char == 'ENTER':
+            self._fire('type', _press, 'enter')
+        elif char == 'ESC':
+            self._fire('type', _press, 'escape')
+        else:
+            self._fire('type', pyautogui.write, char.lower())
     
-    def draw_virtual_keyboard(self, frame):
-        """Draw virtual keyboard overlay"""
-        kb_start_y = self.cam_height - 160
-        
-        # Semi-transparent background
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (0, kb_start_y), (self.cam_width, self.cam_height), (0, 0, 0), -1)
-        frame = cv2.addWeighted(frame, 0.7, overlay, 0.3, 0)
+    def _render_keyboard(self, width):
+        """Pre-render the static virtual keyboard strip for a frame width"""
+        overlay = np.zeros((160, width, 3), dtype=np.uint8)
+        key_origins = {}
         
         # Draw keys
         for row_idx, row in enumerate(self.virtual_keyboard):
             for col_idx, key in enumerate(row):
                 x = col_idx * 60 + 10
-                y = kb_start_y + row_idx * 35 + 10
+                y = row_idx * 35 + 10
+                key_origins[key] = (x, y)
                 
-                cv2.rectangle(frame, (x, y), (x + 50, y + 25), (100, 100, 100), 2)
-                cv2.putText(frame, key, (x + 5, y + 18), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
+                cv2.rectangle(overlay, (x, y), (x + 50, y + 25), (100, 100, 100), 2)
+                cv2.putText(overlay, key, (x + 5, y + 18), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
+        
+        return overlay, key_origins
+    
+    def draw_virtual_keyboard(self, frame, selected_key=None):
+        """Draw virtual keyboard overlay"""
+        # The camera may not honour the requested size, lay out on the actual frame
+        h, w, _ = frame.shape
+        if self._kb_overlay.shape[1] != w:
+            self._kb_overlay, self._kb_key_origins = self._render_keyboard(w)
+        kb_start_y = h - 160
+        
+        # Darken the keyboard strip and add the pre-rendered keys on top
+        strip = frame[max(kb_start_y, 0):h]
+        cv2.addWeighted(strip, 0.7, self._kb_overlay[160 - len(strip):], 1.0, 0, dst=strip)
+        
+        # Highlight the key being pointed at
+        if selected_key is not None:
+            x, y = self._kb_key_origins[selected_key]
+            y += kb_start_y
+            cv2.rectangle(frame, (x, y), (x + 50, y + 25), (0, 255, 0), 2)
         
         return frame
     
-    def detect_complex_gestures(self, landmarks, fingers_up):
+    def detect_complex_gestures(self, pts, mask, current_time):
         """Detect complex multi-step gestures"""
-        gesture_key = str(fingers_up)
-        current_time = time.time()
-        
         # Track gesture persistence
-        if gesture_key == self.persistent_gesture:
-            self.gesture_duration = current_time - self.gesture_start_time.get(gesture_key, current_time)
+        if mask == self.persistent_gesture:
+            self.gesture_duration = current_time - self.gesture_start_time[mask]
         else:
-            self.persistent_gesture = gesture_key
-            self.gesture_start_time[gesture_key] = current_time
+            self.persistent_gesture = mask
+            self.gesture_start_time[mask] = current_time
             self.gesture_duration = 0
         
         # Long press gestures (hold for 2+ seconds)
         if self.gesture_duration > 2.0:
-            if fingers_up == [0, 1, 0, 0, 0]:  # Long index - Precision mode toggle
-                self.gesture_states['precision_mode'] = not self.gesture_states['precision_mode']
-                self.gesture_start_time[gesture_key] = current_time  # Reset timer
+            if mask == INDEX:  # Long index - Precision mode toggle
+                self.gesture_states ^= GState.PRECISION_MODE
+                self.gesture_start_time[mask] = current_time  # Reset timer
                 
-            elif fingers_up == [1, 0, 0, 0, 0]:  # Long thumb - Drawing mode toggle
+            elif mask == THUMB:  # Long thumb - Drawing mode toggle
                 self.drawing_enabled = not self.drawing_enabled
-                self.gesture_start_time[gesture_key] = current_time
+                self.gesture_start_time[mask] = current_time
     
-    def perform_accessibility_features(self, landmarks, fingers_up, frame):
-        """Accessibility and utility features"""
-        if fingers_up == [1, 1, 1, 0, 1]:  # Thumb + Index + Middle + Pinky - Accessibility
-            middle_y = landmarks[12].y
-            if middle_y < 0.3:
-                pyautogui.hotkey('win', '+')  # Magnifier
-                self.display_action(frame, "MAGNIFIER")
-            elif middle_y > 0.7:
-                pyautogui.hotkey('win', 'u')  # Ease of Access
-                self.display_action(frame, "EASE OF ACCESS")
-            else:
-                pyautogui.hotkey('win', 'ctrl', 'enter')  # Narrator
-                self.display_action(frame, "NARRATOR")
-    
-    def perform_scroll_actions(self, landmarks, fingers_up, frame):
-        """Enhanced scrolling with different modes"""
-        if fingers_up == [0, 1, 1, 1, 0]:  # Index + Middle + Ring - Advanced scroll
-            middle_y = landmarks[12].y
-            ring_x = landmarks[16].x
-            
-            # Vertical scroll
-            if ring_x < 0.3 or ring_x > 0.7:
-                if middle_y < 0.3:
-                    pyautogui.scroll(5)  # Fast scroll up
-                    self.display_action(frame, "FAST SCROLL UP")
-                elif middle_y > 0.7:
-                    pyautogui.scroll(-5)  # Fast scroll down
-                    self.display_action(frame, "FAST SCROLL DOWN")
-            else:
-                # Horizontal scroll
-                if middle_y < 0.4:
-                    pyautogui.hscroll(3)  # Horizontal scroll left
-                    self.display_action(frame, "SCROLL LEFT")
-                elif middle_y > 0.6:
-                    pyautogui.hscroll(-3)  # Horizontal scroll right
-                    self.display_action(frame, "SCROLL RIGHT")
-    
-    def detect_mode_switch_gestures(self, landmarks, fingers_up, frame):
-        """Detect gestures that switch between different modes"""
-        # Mode switching with specific gesture combinations
-        if fingers_up == [1, 0, 1, 1, 0]:  # Thumb + Middle + Ring - Cycle modes
-            modes = ["NORMAL", "KEYBOARD", "MEDIA", "WINDOW", "GAMING", "DRAWING"]
-            current_index = modes.index(self.current_mode)
-            next_mode = modes[(current_index + 1) % len(modes)]
-            self.switch_mode(next_mode)
-            self.display_action(frame, f"MODE: {next_mode}")
+    def _cycle_mode(self, pts, frame):
+        """Thumb + Middle + Ring - Cycle modes"""
+        modes = self.MODES
+        current_index = modes.index(self.current_mode)
+        next_mode = modes[(current_index + 1) % len(modes)]
+        self.switch_mode(next_mode)
+        self.display_action(frame, f"MODE: {next_mode}")
     
     def display_action(self, frame, action_text):
         """Display current action on frame"""
+        self._action_text = action_text
         cv2.putText(frame, action_text, (10, 40), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 255), 2)
     
-    def draw_ui_elements(self, frame):
-        """Draw UI elements and information"""
-        h, w, _ = frame.shape
+    def gesture_history(self):
+        """Recorded fingertip positions, oldest first, as an (n, 2) int32 array"""
+        if self._hist_len < len(self._hist):
+            return self._hist[:self._hist_len]
+        return np.concatenate((self._hist[self._hist_head:], self._hist[:self._hist_head]))
+    
+    def _recent_history(self, n):
+        """Last n recorded fingertip positions, oldest first"""
+        return self._hist[np.arange(self._hist_head - n, self._hist_head) % len(self._hist)]
+    
+    def blend_canvas(self, frame):
+        """Add the drawing strokes onto the frame, touching only their bounding box"""
+        x0, y0, x1, y1 = self._canvas_bbox
+        strokes = self.drawing_canvas[y0:y1, x0:x1]
+        roi = frame[y0:y1, x0:x1]
+        cv2.addWeighted(roi, 1.0, strokes, 0.3, 0, dst=roi)
+    
+    def _render_hud(self, width, height, x, highlight):
+        """Pre-render the status text as a premultiplied layer and its inverse alpha"""
+        layer = np.zeros((height, width, 3), dtype=np.uint8)
+        alpha = np.zeros((height, width), dtype=np.uint8)
+        
+        def text(label, y, scale, color, thickness):
+            for img, c in ((layer, color), (alpha, 255)):
+                cv2.putText(img, label, (x, y), cv2.FONT_HERSHEY_SIMPLEX, scale, c, thickness)
         
         # Mode indicator
-        mode_color = (0, 255, 0) if time.time() - self.mode_switch_time < 2 else (255, 255, 255)
-        cv2.putText(frame, f"MODE: {self.current_mode}", (w-200, 30), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, mode_color, 2)
+        mode_color = (0, 255, 0) if highlight else (255, 255, 255)
+        text(f"MODE: {self.current_mode}", 30, 0.6, mode_color, 2)
         
         # Precision mode indicator
-        if self.gesture_states['precision_mode']:
-            cv2.putText(frame, "PRECISION ON", (w-200, 60), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 2)
+        if self.gesture_states & GState.PRECISION_MODE:
+            text("PRECISION ON", 60, 0.5, (255, 255, 0), 2)
         
         # Drawing mode indicator
         if self.drawing_enabled:
-            cv2.putText(frame, "DRAWING ON", (w-200, 90), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 255), 2)
+            text("DRAWING ON", 90, 0.5, (255, 0, 255), 2)
         
         # Status indicators for active modes
         y_offset = 120
-        for state, active in self.gesture_states.items():
-            if active:
-                cv2.putText(frame, state.upper(), (w-200, y_offset), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 255, 0), 1)
+        for state in GState:
+            if self.gesture_states & state:
+                text(state.name, y_offset, 0.4, (0, 255, 0), 1)
                 y_offset += 20
         
+        return layer, cv2.merge([255 - alpha] * 3)
+    
+    def draw_ui_elements(self, frame):
+        """Draw UI elements and information"""
+        h, w, _ = frame.shape
+        
+        # The status column only covers the top right corner, enough for every GState line
+        x0 = max(w - 210, 0)
+        hud_h = min(h, 120 + 20 * len(GState))
+        
+        # Re-render the text only when what it shows changes
+        highlight = time.perf_counter() - self.mode_switch_time < 2
+        key = (self.current_mode, int(self.gesture_states), self.drawing_enabled, highlight, w, hud_h)
+        if key != self._hud_key:
+            self._hud_key = key
+            self._hud_layer, self._hud_inv_alpha = self._render_hud(w - x0, hud_h, w - 200 - x0, highlight)
+        
+        # Fade the frame under the text and add the pre-rendered colours
+        roi = frame[:hud_h, x0:]
+        cv2.multiply(roi, self._hud_inv_alpha, dst=roi, scale=1 / 255)
+        cv2.add(roi, self._hud_layer, dst=roi)
+        
         # Draw gesture history trail
-        if len(self.gesture_history) > 1:
-            for i in range(1, len(self.gesture_history)):
-                prev_point = self.gesture_history[i-1]
-                curr_point = self.gesture_history[i]
-                cv2.line(frame, prev_point, curr_point, (255, 0, 255), 2)
+        if self._hist_len > 1:
+            trail = self.gesture_history().reshape(-1, 1, 2)
+            cv2.polylines(frame, [trail], False, (255, 0, 255), 2)
+    
+    def draw_hand_skeleton(self, frame, pts):
+        """Draw hand connections and landmarks like mp.solutions.drawing_utils"""
+        h, w, _ = frame.shape
+        xy = (pts[:, :2] * (w, h)).astype(np.int32)
+        cv2.polylines(frame, [xy[chain] for chain in self.HAND_CHAINS], False, (224, 224, 224), 2)
+        for x, y in xy.tolist():
+            cv2.circle(frame, (x, y), 2, (0, 0, 255), 2)
     
-    def draw_landmarks_enhanced(self, frame, landmarks, hand_idx=0):
+    def draw_landmarks_enhanced(self, frame, pts, hand_idx=0):
         """Enhanced landmark drawing with additional information"""
         h, w, _ = frame.shape
         
@@ -613,237 +1042,186 @@ class ComprehensiveGestureController:
         colors = [(255, 0, 0), (0, 0, 255)] if hand_idx < 2 else [(255, 255, 0)]
         color = colors[hand_idx]
         
+        # Fingertips in frame pixels: Thumb, Index, Middle, Ring, Pinky
+        tips_xy = (pts[[4, 8, 12, 16, 20], :2] * (w, h)).astype(np.int32)
+        cv2.polylines(frame, [tips_xy.reshape(-1, 1, 2)], False, color, 1)
+        
         # Draw fingertips with different colors
-        fingertips = [4, 8, 12, 16, 20]  # Thumb, Index, Middle, Ring, Pinky
-        for i, tip in enumerate(fingertips):
-            x, y = int(landmarks[tip].x * w), int(landmarks[tip].y * h)
+        for i, (x, y) in enumerate(tips_xy.tolist()):
             cv2.circle(frame, (x, y), 8, color, -1)
             cv2.putText(frame, str(i), (x-5, y-10), cv2.FONT_HERSHEY_SIMPLEX, 0.3, (255, 255, 255), 1)
         
         # Draw palm center
-        palm_center = landmarks[9]
-        px, py = int(palm_center.x * w), int(palm_center.y * h)
+        palm_center = pts[9]
+        px, py = int(palm_center[0] * w), int(palm_center[1] * h)
         cv2.circle(frame, (px, py), 5, (0, 255, 255), -1)
         
         # Add to gesture history for trail effect
-        index_tip = landmarks[8]
-        self.gesture_history.append((int(index_tip.x * w), int(index_tip.y * h)))
-    
-    def perform_text_selection_actions(self, landmarks, fingers_up, frame):
-        """Text selection and editing actions"""
-        if fingers_up == [1, 1, 0, 0, 0]:  # Thumb + Index - Text selection
-            # Calculate selection direction and distance
-            thumb_tip = landmarks[4]
-            index_tip = landmarks[8]
-            
-            # Selection based on hand movement
-            if abs(index_tip.x - thumb_tip.x) > 0.1:  # Horizontal selection
-                if index_tip.x > thumb_tip.x:
-                    pyautogui.hotkey('shift', 'right')
-                    self.display_action(frame, "SELECT RIGHT")
-                else:
-                    pyautogui.hotkey('shift', 'left')
-                    self.display_action(frame, "SELECT LEFT")
-            elif abs(index_tip.y - thumb_tip.y) > 0.1:  # Vertical selection
-                if index_tip.y < thumb_tip.y:
-                    pyautogui.hotkey('shift', 'up')
-                    self.display_action(frame, "SELECT UP")
-                else:
-                    pyautogui.hotkey('shift', 'down')
-                    self.display_action(frame, "SELECT DOWN")
-    
-    def perform_presentation_actions(self, landmarks, fingers_up, frame):
-        """Presentation and slideshow controls"""
-        if fingers_up == [0, 1, 0, 1, 0]:  # Index + Ring - Presentation control
-            index_x = landmarks[8].x
-            ring_y = landmarks[16].y
-            
-            if index_x < 0.3:
-                pyautogui.press('left')  # Previous slide
-                self.display_action(frame, "PREVIOUS SLIDE")
-            elif index_x > 0.7:
-                pyautogui.press('right')  # Next slide
-                self.display_action(frame, "NEXT SLIDE")
-            elif ring_y < 0.3:
-                pyautogui.press('f5')  # Start slideshow
-                self.display_action(frame, "START SLIDESHOW")
-            elif ring_y > 0.7:
-                pyautogui.press('escape')  # Exit slideshow
-                self.display_action(frame, "EXIT SLIDESHOW")
-    
-    def perform_zoom_meeting_actions(self, landmarks, fingers_up, frame):
-        """Video conferencing controls"""
-        if fingers_up == [1, 0, 0, 1, 0]:  # Thumb + Ring - Video controls
-            thumb_y = landmarks[4].y
-            ring_x = landmarks[16].x
-            
-            if thumb_y < 0.3:
-                pyautogui.hotkey('alt', 'v')  # Toggle video
-                self.display_action(frame, "TOGGLE VIDEO")
-            elif thumb_y > 0.7:
-                pyautogui.hotkey('alt', 'a')  # Toggle audio
-                self.display_action(frame, "TOGGLE AUDIO")
-            elif ring_x < 0.3:
-                pyautogui.hotkey('alt', 's')  # Share screen
-                self.display_action(frame, "SHARE SCREEN")
-            elif ring_x > 0.7:
-                pyautogui.hotkey('alt', 'r')  # Record
-                self.display_action(frame, "TOGGLE RECORD")
-    
-    def perform_ide_actions(self, landmarks, fingers_up, frame):
+        self._hist[self._hist_head] = tips_xy[1]
+        self._hist_head = (self._hist_head + 1) % len(self._hist)
+        self._hist_len = min(self._hist_len + 1, len(self._hist))
+    
+    def perform_ide_actions(self, pts, mask, frame):
         """IDE and coding-specific shortcuts"""
-        if fingers_up == [0, 1, 0, 0, 0] and self.current_mode == "CODING":
+        if mask == INDEX and self.current_mode == "CODING":
             # Run code
-            pyautogui.hotkey('f5')
+            self._fire('f5', _hotkey, 'f5')
             self.display_action(frame, "RUN CODE")
             
-        elif fingers_up == [0, 1, 1, 0, 0] and self.current_mode == "CODING":
+        elif mask == INDEX | MIDDLE and self.current_mode == "CODING":
             # Debug
-            pyautogui.hotkey('f9')
+            self._fire('f9', _hotkey, 'f9')
             self.display_action(frame, "TOGGLE BREAKPOINT")
             
-        elif fingers_up == [1, 1, 1, 0, 0] and self.current_mode == "CODING":
+        elif mask == THUMB | INDEX | MIDDLE and self.current_mode == "CODING":
             # Format code
-            pyautogui.hotkey('ctrl', 'shift', 'f')
+            self._fire('ctrl+shift+f', _hotkey, 'ctrl', 'shift', 'f')
             self.display_action(frame, "FORMAT CODE")
     
-    def calculate_gesture_confidence(self, landmarks):
+    def calculate_gesture_confidence(self, pts):
         """Calculate confidence score for gesture recognition"""
         # Check hand stability
-        if len(self.gesture_history) < 3:
+        if self._hist_len < 3:
             return 0.5
         
         # Calculate movement variance
-        recent_points = list(self.gesture_history)[-3:]
-        variance = np.var([p[0] for p in recent_points]) + np.var([p[1] for p in recent_points])
+        recent_points = self._recent_history(3)
+        variance = recent_points.var(axis=0).sum()
         
         # Lower variance = higher confidence
         confidence = max(0.1, 1.0 - variance / 1000)
         return min(1.0, confidence)
     
-    def perform_custom_shortcuts(self, landmarks, fingers_up, frame):
-        """Custom application shortcuts"""
-        # Application-specific shortcuts
-        app_shortcuts = {
-            # Browser shortcuts
-            '[0, 1, 1, 0, 1]': ('ctrl', 'shift', 't'),  # Reopen closed tab
-            '[1, 0, 1, 1, 1]': ('ctrl', 'shift', 'n'),  # Incognito window
-            
-            # File manager shortcuts
-            '[1, 1, 0, 1, 0]': ('ctrl', 'shift', 'n'),  # New folder
-            '[0, 1, 0, 1, 1]': ('f2',),  # Rename
-            
-            # General shortcuts
-            '[1, 0, 0, 1, 1]': ('win', 'x'),  # Quick admin menu
-            '[0, 0, 1, 1, 1]': ('ctrl', 'shift', 'esc'),  # Task manager
-        }
-        
-        gesture_key = str(fingers_up)
-        if gesture_key in app_shortcuts:
-            keys = app_shortcuts[gesture_key]
-            pyautogui.hotkey(*keys)
-            action_name = ' + '.join(keys).upper()
-            self.display_action(frame, f"SHORTCUT: {action_name}")
-    
-    def perform_mouse_precision_actions(self, landmarks, fingers_up, frame):
+    def perform_mouse_precision_actions(self, pts, mask, frame):
         """Precision mouse movements and selections"""
-        if self.gesture_states['precision_mode']:
+        if self.gesture_states & GState.PRECISION_MODE:
             # Micro movements with pinky control
-            if fingers_up[4]:  # Pinky up for precision
-                pinky_tip = landmarks[20]
+            if mask & PINKY:  # Pinky up for precision
+                pinky_tip = pts[20]
                 
                 # Micro adjustments
-                offset_x = (pinky_tip.x - 0.5) * 10  # Small movements
-                offset_y = (pinky_tip.y - 0.5) * 10
+                offset_x = (pinky_tip[0] - 0.5) * 10  # Small movements
+                offset_y = (pinky_tip[1] - 0.5) * 10
                 
-                current_pos = pyautogui.position()
-                new_x = current_pos.x + offset_x
-                new_y = current_pos.y + offset_y
+                # Where we last sent the cursor, pyautogui.position() would be a system call
+                new_x = self._cursor_pos[0] + offset_x
+                new_y = self._cursor_pos[1] + offset_y
                 
-                pyautogui.moveTo(new_x, new_y)
+                self._emit(pyautogui.moveTo, new_x, new_y)
+                self._cursor_pos = (new_x, new_y)
                 self.display_action(frame, "PRECISION MOVE")
     
-    def handle_emergency_gestures(self, landmarks, fingers_up, frame):
+    def handle_emergency_gestures(self, pts, mask, frame):
         """Emergency and safety gestures"""
         # Emergency stop - specific gesture pattern
-        if fingers_up == [1, 0, 1, 0, 1]:  # Alternating pattern
-            thumb_y = landmarks[4].y
+        if mask == THUMB | MIDDLE | PINKY:  # Alternating pattern
+            thumb_y = pts[4, 1]
             if thumb_y < 0.1:  # Very top of screen
                 # Emergency stop all automation
-                self.gesture_states = {key: False for key in self.gesture_states}
-                pyautogui.mouseUp()  # Release any held buttons
+                self.gesture_states = GState(0)
+                self._emit(pyautogui.mouseUp)  # Release any held buttons
                 self.display_action(frame, "EMERGENCY STOP")
     
     def main_gesture_processor(self, landmarks_list, frame):
-        """Main gesture processing pipeline"""
+        """Main gesture processing pipeline over (21, 3) landmark arrays"""
         if not landmarks_list:
             return
         
+        # Hands may be reordered when the count changes, restart smoothing
+        if len(landmarks_list) != self._tracked_hands:
+            self._tracked_hands = len(landmarks_list)
+            for landmark_filter in self._landmark_filters:
+                landmark_filter.reset()
+        
+        current_time = self._now = time.perf_counter()
+        
+        # Bind the per-hand lookups once instead of once per hand and call
+        filters = self._landmark_filters
+        xy_cam, cam_scale = self._xy_cam, self._cam_scale
+        xy_scr, scr_scale = self._xy_scr, self._scr_scale
+        hands_xy = self._hands_xy
+        detect_gesture = self.detect_gesture
+        gesture_confidence = self.calculate_gesture_confidence
+        draw_skeleton = self.draw_hand_skeleton
+        draw_landmarks = self.draw_landmarks_enhanced
+        always_handlers = self._always_handlers
+        complex_gestures = self.detect_complex_gestures
+        mode_handlers = self._mode_handlers
+        dispatch, always_dispatch = self._dispatch, self._always_dispatch
+        held = self._held
+        cooldown = self.gesture_cooldown
+        precision_actions = self.perform_mouse_precision_actions
+        
         # Process each detected hand
         for hand_idx, landmarks in enumerate(landmarks_list):
-            fingers_up = self.detect_gesture(landmarks)
-            confidence = self.calculate_gesture_confidence(landmarks)
+            # Fingers up/down from the detection itself, smoothing lags each finger
+            # differently and would produce short-lived in-between gestures
+            mask = detect_gesture(landmarks)
             
-            # Draw enhanced landmarks
-            self.draw_landmarks_enhanced(frame, landmarks, hand_idx)
+            # One filtered (21, 3) array per hand for positions, reused by every gesture handler
+            pts = filters[hand_idx](landmarks, current_time)
+            self._pts = pts
+            np.multiply(pts[:, :2], cam_scale, out=xy_cam)
+            np.multiply(pts[:, :2], scr_scale, out=xy_scr)
+            # Keep each hand for the two-hand gestures
+            np.multiply(pts[:, :2], cam_scale, out=hands_xy[hand_idx])
+            confidence = gesture_confidence(pts)
             
-            # Emergency gestures (highest priority)
-            self.handle_emergency_gestures(landmarks, fingers_up, frame)
+            # Unsteady tracking, run a full detection on the next frame
+            if confidence < self._redetect_confidence:
+                self._redetect = True
+            
+            # Draw hand connections and enhanced landmarks from the same filtered points
+            draw_skeleton(frame, pts)
+            draw_landmarks(frame, pts, hand_idx)
             
-            # Mode switching
-            self.detect_mode_switch_gestures(landmarks, fingers_up, frame)
+            # Emergency gestures (highest priority)
+            for handler in always_handlers:
+                handler(pts, mask, frame)
             
             # Complex gesture detection
-            self.detect_complex_gestures(landmarks, fingers_up)
+            complex_gestures(pts, mask, current_time)
             
-            # Mode-specific actions
-            if self.current_mode == "NORMAL":
-                self.perform_basic_mouse_actions(landmarks, fingers_up, frame)
-                self.perform_scroll_actions(landmarks, fingers_up, frame)
-                
-            elif self.current_mode == "KEYBOARD":
-                self.perform_keyboard_actions(landmarks, fingers_up, frame)
-                self.perform_text_selection_actions(landmarks, fingers_up, frame)
-                
-            elif self.current_mode == "MEDIA":
-                self.perform_media_controls(landmarks, fingers_up, frame)
-                
-            elif self.current_mode == "WINDOW":
-                self.perform_window_management(landmarks, fingers_up, frame)
-                self.perform_browser_actions(landmarks, fingers_up, frame)
-                
-            elif self.current_mode == "GAMING":
-                self.perform_gaming_actions(landmarks, fingers_up, frame)
-                
-            elif self.current_mode == "DRAWING":
-                self.perform_drawing_actions(landmarks, fingers_up, frame)
+            mode = self.current_mode
+            
+            # Continuous tracking, e.g. the cursor follows the index finger in NORMAL mode
+            for handler in mode_handlers.get(mode, ()):
+                handler(pts, frame)
+            
+            # Mode-specific and always available actions for this gesture
+            table = dispatch.get(mode, always_dispatch)
+            continuous, discrete, one_shot = table.get(mask, ((), (), ()))
+            for handler in continuous:
+                handler(pts, frame)
+            
+            # A held gesture only repeats its discrete actions once the cooldown has passed,
+            # one-shot actions only run when the gesture starts
+            last_mask, last_time, label = held[hand_idx]
+            started = mask != last_mask
+            if started or current_time - last_time >= cooldown:
+                self._action_text = None if started else label
+                for handler in (one_shot + discrete if started else discrete):
+                    handler(pts, frame)
+                held[hand_idx] = (mask, current_time, self._action_text)
+            elif label:
+                # Keep showing what the held gesture did
+                self.display_action(frame, label)
             
-            # Always available actions
-            self.perform_system_actions(landmarks, fingers_up, frame)
-            self.perform_accessibility_features(landmarks, fingers_up, frame)
-            self.perform_presentation_actions(landmarks, fingers_up, frame)
-            self.perform_zoom_meeting_actions(landmarks, fingers_up, frame)
-            self.perform_custom_shortcuts(landmarks, fingers_up, frame)
-            self.perform_mouse_precision_actions(landmarks, fingers_up, frame)
+            precision_actions(pts, mask, frame)
         
         # Two-hand gestures
         if len(landmarks_list) == 2:
             self.perform_two_hand_gestures(landmarks_list, frame)
-            self.gesture_states['two_hand_mode'] = True
+            self.gesture_states |= GState.TWO_HAND_MODE
         else:
-            self.gesture_states['two_hand_mode'] = False
+            self.gesture_states &= ~GState.TWO_HAND_MODE
     
-    def draw_help_overlay(self, frame):
-        """Draw comprehensive help overlay"""
-        h, w, _ = frame.shape
-        
-        # Create semi-transparent overlay
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (10, h-300), (w-10, h-10), (0, 0, 0), -1)
-        frame = cv2.addWeighted(frame, 0.8, overlay, 0.2, 0)
+    def _render_help(self, width, height):
+        """Pre-render the help text for the current mode onto a black panel, keeping its bottom rows"""
+        layer = np.zeros((291, width, 3), dtype=np.uint8)
         
         help_text = [
-            f"MODE: {self.current_mode} | Precision: {'ON' if self.gesture_states['precision_mode'] else 'OFF'}",
+            f"MODE: {self.current_mode} | Precision: {'ON' if self.gesture_states & GState.PRECISION_MODE else 'OFF'}",
             "BASIC: Index=Move | Index+Middle=Click | Thumb+Index+Middle=RightClick",
             "SCROLL: 3Fingers=Scroll | 4Fingers=DoubleClick | 5Fingers=Drag | Fist=Stop",
             "MEDIA: Thumb+Pinky=Volume | Index+Ring=PlayControl | Middle=Stop",
@@ -854,8 +1232,29 @@ class ComprehensiveGestureController:
         ]
         
         for i, text in enumerate(help_text):
-            y_pos = h - 280 + i * 25
-            cv2.putText(frame, text, (15, y_pos), cv2.FONT_HERSHEY_SIMPLEX, 0.35, (255, 255, 255), 1)
+            y_pos = 20 + i * 25
+            cv2.putText(layer, text, (5, y_pos), cv2.FONT_HERSHEY_SIMPLEX, 0.35, (255, 255, 255), 1)
+        
+        return layer[291 - height:]
+    
+    def draw_help_overlay(self, frame):
+        """Draw comprehensive help overlay"""
+        h, w, _ = frame.shape
+        
+        # Frames shorter than the panel cut off its top, like drawing past the edge would
+        panel_h = min(291, h - 9)
+        if panel_h <= 0:
+            return frame
+        
+        # Text only changes with the mode and precision state, render it once per state
+        key = (self.current_mode, self.gesture_states & GState.PRECISION_MODE, w, panel_h)
+        if key != self._help_key:
+            self._help_key = key
+            self._help_layer = self._render_help(w - 19, panel_h)
+        
+        # Darken the panel and add the pre-rendered text on top
+        panel = frame[h-9-panel_h:h-9, 10:w-9]
+        cv2.addWeighted(panel, 0.8, self._help_layer, 1.0, 0, dst=panel)
         
         return frame
     
@@ -868,24 +1267,39 @@ class ComprehensiveGestureController:
             'current_mode': self.current_mode
         }
         try:
-            with open(filename, 'w') as f:
-                json.dump(profile, f)
+            with open(filename, 'wb') as f:
+                f.write(_json_dumps(profile))
             return True
-        except:
+        except OSError:
             return False
     
     def load_gesture_profile(self, filename="gesture_profile.json"):
         """Load gesture settings"""
         try:
-            with open(filename, 'r') as f:
-                profile = json.load(f)
-                self.smoothening = profile.get('smoothening', 7)
-                self.click_threshold = profile.get('click_threshold', 35)
-                self.gesture_cooldown = profile.get('gesture_cooldown', 0.3)
-                self.current_mode = profile.get('current_mode', "NORMAL")
-            return True
-        except:
+            with open(filename, 'rb') as f:
+                profile = _json_loads(f.read())
+        except (OSError, ValueError):
+            # Missing or unreadable file, ValueError covers both backends' decode errors
+            return False
+        if not isinstance(profile, dict):
+            return False
+        
+        # Check every value before applying any, a bad profile leaves the settings alone
+        smoothening = profile.get('smoothening', 7)
+        click_threshold = profile.get('click_threshold', 35)
+        gesture_cooldown = profile.get('gesture_cooldown', 0.3)
+        current_mode = profile.get('current_mode', "NORMAL")
+        numbers = (smoothening, click_threshold, gesture_cooldown)
+        if (not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in numbers)
+                or current_mode not in self.MODES):
             return False
+        
+        self.smoothening = smoothening
+        self.click_threshold = click_threshold
+        self._click_threshold2 = click_threshold ** 2
+        self.gesture_cooldown = gesture_cooldown
+        self.current_mode = current_mode
+        return True
     
     def calibrate_user(self, frame):
         """User calibration for personalized gesture recognition"""
@@ -894,11 +1308,126 @@ class ComprehensiveGestureController:
                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
         # Add calibration logic here
     
+    def _grab_loop(self, cap):
+        """Keep draining the camera and hand out the newest frame on request"""
+        stopped, grab, retrieve, flip = self._stop_event.is_set, cap.grab, cap.retrieve, cv2.flip
+        wanted = self._frame_wanted
+        frame_queue = self._frame_queue
+        while not stopped():
+            if not grab():
+                self._stop_event.set()
+                break
+            
+            # Only decode when the inference thread is ready for a frame
+            if wanted.is_set():
+                wanted.clear()
+                ret, frame = retrieve()
+                if ret:
+                    # Flip frame for mirror effect
+                    _put_latest(frame_queue, flip(frame, 1))
+    
+    def _create_landmarker(self):
+        """Create the Tasks hand landmarker on the GPU if possible, None if unavailable"""
+        tasks = getattr(mp, 'tasks', None)
+        if tasks is None or not os.path.exists(self.HAND_LANDMARKER_MODEL):
+            return None
+        
+        for delegate in (tasks.BaseOptions.Delegate.GPU, tasks.BaseOptions.Delegate.CPU):
+            options = tasks.vision.HandLandmarkerOptions(
+                base_options=tasks.BaseOptions(model_asset_path=self.HAND_LANDMARKER_MODEL,
+                                               delegate=delegate),
+                running_mode=tasks.vision.RunningMode.VIDEO,
+                num_hands=2,
+                min_hand_detection_confidence=0.7,
+                min_tracking_confidence=0.5
+            )
+            try:
+                return tasks.vision.HandLandmarker.create_from_options(options)
+            except (RuntimeError, NotImplementedError):
+                # No GPU delegate on this platform, try the next one
+                continue
+        return None
+    
+    def _detect_hands(self, rgb):
+        """Landmark lists of the hands found in an RGB image"""
+        if self._landmarker is None:
+            results = self.hands.process(rgb)
+            return [hand.landmark for hand in results.multi_hand_landmarks or ()]
+        
+        # Video mode needs strictly increasing timestamps
+        self._landmarker_ts = max(self._landmarker_ts + 1, int(time.perf_counter() * 1000))
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
+        return self._landmarker.detect_for_video(image, self._landmarker_ts).hand_landmarks
+    
+    def _inference_loop(self):
+        """Run hand tracking on the newest frame and publish the results"""
+        stopped, want_frame, next_frame = self._stop_event.is_set, self._frame_wanted.set, self._frame_queue.get
+        resize, cvt = cv2.resize, cv2.cvtColor
+        small_buf, rgb_buf, infer_size = self._small_buf, self._rgb_buf, self._infer_size
+        detect_hands = self._detect_hands
+        while not stopped():
+            want_frame()
+            try:
+                frame = next_frame(timeout=0.5)
+            except queue.Empty:
+                continue
+            
+            # Full detection every few frames, reuse the tracked hands in between
+            if (not self._last_hands or self._redetect
+                    or self._frame_idx % self._detection_every == 0):
+                # Convert to RGB for MediaPipe
+                resize(frame, infer_size, dst=small_buf, interpolation=cv2.INTER_AREA)
+                cvt(small_buf, cv2.COLOR_BGR2RGB, dst=rgb_buf)
+                # Read-only input lets MediaPipe wrap the buffer instead of copying it
+                rgb_buf.flags.writeable = False
+                try:
+                    detected = detect_hands(rgb_buf)
+                finally:
+                    rgb_buf.flags.writeable = True
+                # Convert once per detection so the main thread only sees arrays
+                self._last_hands = tuple(_landmark_array(hand) for hand in detected)
+                self._redetect = False
+            self._frame_idx += 1
+            
+            _put_latest(self._result_queue, (frame, self._last_hands))
+    
+    def _run_worker(self, loop, *args):
+        """Run a worker loop, stopping the controller if it raises"""
+        try:
+            loop(*args)
+        except Exception as e:
+            # Hand the error to run(), the display loop would otherwise wait forever
+            if self._worker_error is None:
+                self._worker_error = e
+            self._stop_event.set()
+    
+    def _action_loop(self):
+        """Execute queued pyautogui calls off the capture and display path"""
+        while True:
+            action = self._action_queue.get()
+            if action is None:
+                break
+            
+            func, args = action
+            try:
+                func(*args)
+            except Exception as e:
+                # Includes the pyautogui fail-safe, stop the controller
+                self._worker_error = e
+                self._stop_event.set()
+                break
+    
     def run(self):
         """Enhanced main execution loop"""
-        cap = cv2.VideoCapture(0)
+        # Hardware decoding is only picked up when the capture is opened
+        cap = cv2.VideoCapture(0, cv2.CAP_ANY,
+                               [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+        # Ask for compressed MJPG instead of raw YUYV
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
         cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.cam_width)
         cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.cam_height)
+        # Avoid serving stale frames from the driver queue
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
         
         # Try to load saved settings
         self.load_gesture_profile()
@@ -942,37 +1471,43 @@ class ComprehensiveGestureController:
         show_help = False
         calibration_mode = False
         
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
-            # Flip frame for mirror effect
-            frame = cv2.flip(frame, 1)
-            
-            # Convert to RGB for MediaPipe
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.hands.process(rgb_frame)
+        # Capture and inference run on their own threads, this one handles display
+        self._stop_event.clear()
+        self._worker_error = None
+        workers = [
+            threading.Thread(target=self._run_worker, args=(self._grab_loop, cap), daemon=True),
+            threading.Thread(target=self._run_worker, args=(self._inference_loop,), daemon=True)
+        ]
+        self._action_thread = threading.Thread(target=self._action_loop, daemon=True)
+        for worker in workers + [self._action_thread]:
+            worker.start()
+        
+        # Bind the per-frame lookups once, outside the display loop
+        stopped, next_result = self._stop_event.is_set, self._result_queue.get
+        draw_skeleton, process_gestures = self.draw_hand_skeleton, self.main_gesture_processor
+        draw_ui, imshow, wait_key = self.draw_ui_elements, cv2.imshow, cv2.waitKey
+        while not stopped():
+            try:
+                frame, hands = next_result(timeout=0.5)
+            except queue.Empty:
+                continue
             
             # Process hand landmarks
-            landmarks_list = []
-            if results.multi_hand_landmarks:
-                for hand_landmarks in results.multi_hand_landmarks:
-                    # Draw hand connections
-                    self.mp_draw.draw_landmarks(frame, hand_landmarks, 
-                                              self.mp_hands.HAND_CONNECTIONS)
-                    landmarks_list.append(hand_landmarks.landmark)
-                
-                # Process gestures
-                if not calibration_mode:
-                    self.main_gesture_processor(landmarks_list, frame)
+            if hands:
+                if calibration_mode:
+                    # Nothing is filtered while calibrating, draw the raw hands
+                    for hand in hands:
+                        draw_skeleton(frame, hand)
+                else:
+                    # Process gestures, this also draws the filtered hands
+                    process_gestures(hands, frame)
             
             # Add drawing canvas overlay if enabled
-            if self.drawing_enabled:
-                frame = cv2.addWeighted(frame, 0.7, self.drawing_canvas, 0.3, 0)
+            if self.drawing_enabled and self._canvas_bbox is not None:
+                self.blend_canvas(frame)
             
             # Draw UI elements
-            self.draw_ui_elements(frame)
+            draw_ui(frame)
             
             # Calibration mode
             if calibration_mode:
@@ -983,11 +1518,12 @@ class ComprehensiveGestureController:
                 frame = self.draw_help_overlay(frame)
             
             # Show frame
-            cv2.imshow('Comprehensive Gesture Controller', frame)
+            imshow('Comprehensive Gesture Controller', frame)
             
             # Handle keyboard input
-            key = cv2.waitKey(1) & 0xFF
+            key = wait_key(1) & 0xFF
             if key == ord('q'):
+                self._stop_event.set()
                 break
             elif key == ord('h'):
                 show_help = not show_help
@@ -1000,19 +1536,42 @@ class ComprehensiveGestureController:
                     print("❌ Failed to save profile")
             elif key == ord('r'):
                 # Reset all modes and states
-                self.gesture_states = {key: False for key in self.gesture_states}
+                self.gesture_states = GState(0)
                 self.current_mode = "NORMAL"
                 print("🔄 All modes reset")
         
         # Cleanup
+        self._stop_event.set()
+        for worker in workers:
+            worker.join()
+        self._action_queue.put(None)
+        self._action_thread.join()
+        self._action_thread = None
         cap.release()
+        if self._landmarker is not None:
+            self._landmarker.close()
         cv2.destroyAllWindows()
         
+        if self._worker_error is not None:
+            raise self._worker_error
+        
         # Save settings on exit
         self.save_gesture_profile()
 
 # Specialized controller for specific use cases
 class SpecializedGestureController(ComprehensiveGestureController):
+    # Productivity and workflow shortcuts, gesture mask -> (keys, label)
+    PRODUCTIVITY_SHORTCUTS = {
+        # Quick app launching
+        THUMB | PINKY: (('win', 'r'), 'RUN DIALOG'),  # Thumb + Pinky
+        
+        # Quick system actions
+        MIDDLE | PINKY: (('ctrl', 'alt', 'del'), 'CTRL+ALT+DEL'),  # Middle + Pinky
+        
+        # Clipboard history
+        THUMB | MIDDLE: (('win', 'v'), 'CLIPBOARD HISTORY'),  # Thumb + Middle
+    }
+    
     def __init__(self):
         super().__init__()
         self.eye_tracking_mode = False
@@ -1020,11 +1579,14 @@ class SpecializedGestureController(ComprehensiveGestureController):
         self.macro_recording = False
         self.recorded_macros = {}
         self.current_macro = []
+        # One long-lived player, at most one macro waiting behind the one playing
+        self._macro_queue = queue.Queue(maxsize=1)
+        threading.Thread(target=self._macro_worker, daemon=True).start()
         
-    def perform_macro_actions(self, landmarks, fingers_up, frame):
+    def perform_macro_actions(self, pts, mask, frame):
         """Record and playback gesture macros"""
-        if fingers_up == [1, 1, 1, 1, 0]:  # Four fingers - Macro control
-            ring_y = landmarks[16].y
+        if mask == THUMB | INDEX | MIDDLE | RING:  # Four fingers - Macro control
+            ring_y = pts[16, 1]
             
             if ring_y < 0.2:  # Start recording
                 if not self.macro_recording:
@@ -1047,86 +1609,78 @@ class SpecializedGestureController(ComprehensiveGestureController):
         # Record current gesture if recording
         if self.macro_recording:
             self.current_macro.append({
-                'fingers': fingers_up,
-                'position': (landmarks[8].x, landmarks[8].y),
-                'timestamp': time.time()
+                'fingers': mask,
+                'position': (pts[8, 0], pts[8, 1]),
+                'timestamp': self._now
             })
     
     def playback_macro(self, macro):
-        """Playback recorded macro"""
-        def play():
-            for gesture in macro:
-                # Simulate the recorded gesture
-                x = int(gesture['position'][0] * self.screen_width)
-                y = int(gesture['position'][1] * self.screen_height)
-                pyautogui.moveTo(x, y)
-                
-                # Add small delay between actions
-                time.sleep(0.1)
-        
-        # Run macro in separate thread to avoid blocking
-        threading.Thread(target=play, daemon=True).start()
+        """Queue a recorded macro for playback"""
+        if not macro:
+            return
+        try:
+            self._macro_queue.put_nowait(macro)
+        except queue.Full:
+            # A replay is already waiting, drop repeats instead of piling them up
+            pass
+    
+    def _macro_worker(self):
+        """Play queued macros without blocking the display loop"""
+        while True:
+            macro = self._macro_queue.get()
+            try:
+                self._play_macro(macro)
+            except Exception as e:
+                # Includes the pyautogui fail-safe, stop the controller
+                self._worker_error = e
+                self._stop_event.set()
+    
+    def _play_macro(self, macro):
+        """Replay a macro with the timing it was recorded with"""
+        start = time.perf_counter()
+        first = macro[0]['timestamp']
+        for gesture in macro:
+            # Sleep until this gesture's recorded offset instead of a fixed step
+            delay = start + (gesture['timestamp'] - first) - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            
+            # Simulate the recorded gesture
+            x = int(gesture['position'][0] * self.screen_width)
+            y = int(gesture['position'][1] * self.screen_height)
+            pyautogui.moveTo(x, y)
+            self._cursor_pos = (x, y)
     
-    def perform_advanced_selection(self, landmarks, fingers_up, frame):
+    def perform_advanced_selection(self, pts, mask, frame):
         """Advanced text and object selection"""
-        if fingers_up == [1, 1, 0, 1, 0]:  # Thumb + Index + Ring - Smart selection
-            thumb_tip = landmarks[4]
-            index_tip = landmarks[8]
-            ring_tip = landmarks[16]
+        if mask == THUMB | INDEX | RING:  # Thumb + Index + Ring - Smart selection
+            cam = self._xy_cam
             
             # Triple click for paragraph selection
-            if self.get_distance(
-                (thumb_tip.x * self.cam_width, thumb_tip.y * self.cam_height),
-                (ring_tip.x * self.cam_width, ring_tip.y * self.cam_height)
-            ) < 30:
-                pyautogui.tripleClick()
+            if _dist2(cam[4, 0], cam[4, 1], cam[16, 0], cam[16, 1]) < 30 ** 2:
+                self._fire('tripleclick', pyautogui.tripleClick)
                 self.display_action(frame, "SELECT PARAGRAPH")
             
             # Select all
-            elif index_tip.y < 0.1:
-                pyautogui.hotkey('ctrl', 'a')
+            elif pts[8, 1] < 0.1:
+                self._fire('ctrl+a', _hotkey, 'ctrl', 'a')
                 self.display_action(frame, "SELECT ALL")
     
-    def perform_productivity_shortcuts(self, landmarks, fingers_up, frame):
+    def perform_productivity_shortcuts(self, pts, mask, frame):
         """Productivity and workflow shortcuts"""
-        productivity_gestures = {
-            # Quick app launching
-            '[1, 0, 0, 0, 1]': {  # Thumb + Pinky
-                'action': lambda: pyautogui.hotkey('win', 'r'),
-                'name': 'RUN DIALOG'
-            },
-            
-            # Quick system actions
-            '[0, 0, 1, 0, 1]': {  # Middle + Pinky
-                'action': lambda: pyautogui.hotkey('ctrl', 'alt', 'del'),
-                'name': 'CTRL+ALT+DEL'
-            },
-            
-            # Clipboard history
-            '[1, 0, 1, 0, 0]': {  # Thumb + Middle
-                'action': lambda: pyautogui.hotkey('win', 'v'),
-                'name': 'CLIPBOARD HISTORY'
-            }
-        }
-        
-        gesture_key = str(fingers_up)
-        if gesture_key in productivity_gestures:
-            gesture_info = productivity_gestures[gesture_key]
-            gesture_info['action']()
-            self.display_action(frame, gesture_info['name'])
+        shortcut = self.PRODUCTIVITY_SHORTCUTS.get(mask)
+        if shortcut is not None:
+            keys, name = shortcut
+            self._fire('+'.join(keys), _hotkey, *keys)
+            self.display_action(frame, name)
     
-    def detect_gesture_speed(self, landmarks):
+    def detect_gesture_speed(self, pts):
         """Detect gesture speed for variable actions"""
-        if len(self.gesture_history) < 5:
+        if self._hist_len < 5:
             return "SLOW"
         
         # Calculate average speed over last few frames
-        distances = []
-        for i in range(1, min(5, len(self.gesture_history))):
-            dist = self.get_distance(self.gesture_history[i-1], self.gesture_history[i])
-            distances.append(dist)
-        
-        avg_speed = sum(distances) / len(distances)
+        avg_speed = np.linalg.norm(np.diff(self._recent_history(5), axis=0), axis=1).mean()
         
         if avg_speed > 20:
             return "FAST"
@@ -1135,17 +1689,17 @@ class SpecializedGestureController(ComprehensiveGestureController):
         else:
             return "SLOW"
     
-    def perform_speed_dependent_actions(self, landmarks, fingers_up, frame, speed):
+    def perform_speed_dependent_actions(self, pts, mask, frame, speed):
         """Actions that depend on gesture speed"""
-        if fingers_up == [0, 1, 1, 1, 0]:  # Index + Middle + Ring
+        if mask == INDEX | MIDDLE | RING:  # Index + Middle + Ring
             if speed == "FAST":
-                pyautogui.scroll(10)  # Fast scroll
+                self._emit(pyautogui.scroll, 10)  # Fast scroll
                 self.display_action(frame, "FAST SCROLL")
             elif speed == "MEDIUM":
-                pyautogui.scroll(3)  # Normal scroll
+                self._emit(pyautogui.scroll, 3)  # Normal scroll
                 self.display_action(frame, "NORMAL SCROLL")
             else:
-                pyautogui.scroll(1)  # Slow scroll
+                self._emit(pyautogui.scroll, 1)  # Slow scroll
                 self.display_action(frame, "PRECISE SCROLL")
 
 def create_gesture_tutorial():